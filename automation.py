@@ -6,96 +6,213 @@ Orchestrates news fetching, content generation, and file saving.
 import os
 import time
 import argparse
+import hashlib
+import logging
+import re
+import string
+import sys
+import unicodedata
 import schedule
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import MemoryHandler
 from datetime import datetime
+from typing import List, Optional, Tuple
 from news_fetcher import NewsFetcher
 from image_generator import ImageGenerator
 from caption_generator import CaptionGenerator
 from config import OUTPUT_DIR, LOGS_DIR
 
+# Drops every ASCII character that isn't safe in a filename
+_FILENAME_ALLOWED = set(string.ascii_letters + string.digits + " -_")
+_FILENAME_TRANS = str.maketrans({c: None for c in map(chr, range(128)) if c not in _FILENAME_ALLOWED})
+_NON_WORD_RE = re.compile(r'\W+')
+
+# Cycle progress is buffered and written out in chunks (immediately on errors)
+logger = logging.getLogger("automation")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+# stdout, like the module's print() output, so redirected logs stay on one stream
+_log_buffer = MemoryHandler(capacity=50, flushLevel=logging.ERROR, target=logging.StreamHandler(sys.stdout))
+_log_buffer.target.setFormatter(logging.Formatter("%(message)s"))
+logger.addHandler(_log_buffer)
+# Caption progress joins the same buffer instead of printing ahead of it
+logging.getLogger("captions").handlers = [_log_buffer]
+
 class InstagramAutomation:
+    # Parallel category workers; also keeps us under OpenRouter rate limits
+    MAX_CONCURRENT_CATEGORIES = 5
+    TARGET_CATEGORIES = ["politics", "technology", "business", "sports", "entertainment"]
+    
     def __init__(self):
         self.news_fetcher = NewsFetcher()
         self.image_generator = ImageGenerator()
         self.caption_generator = CaptionGenerator()
         
         self._ensure_dirs()
+        _log_buffer.flush()  # setup warnings from the generators before our own banner
         print("🚀 Instagram Automation System Initialized")
 
     def _ensure_dirs(self):
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         os.makedirs(LOGS_DIR, exist_ok=True)
 
-    def _get_output_path(self, date_str):
-        path = os.path.join(OUTPUT_DIR, date_str)
-        os.makedirs(path, exist_ok=True)
-        return path
-
     def run_cycle(self):
-        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Starting generation cycle...")
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        output_path = self._get_output_path(date_str)
+        # One timestamp per cycle so logs and the output folder agree across midnight
+        now = datetime.now()
+        date_str = now.strftime("%Y-%m-%d")
+        logger.info(f"\n[{now.strftime('%H:%M:%S')}] Starting generation cycle...")
+        output_path = os.path.join(OUTPUT_DIR, date_str)
+        os.makedirs(output_path, exist_ok=True)
+        
+        # Articles are independent and network-bound, so run them side by side
+        articles = self._fetch_articles()
+        with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_CATEGORIES) as pool:
+            results = pool.map(lambda item: self._try_process_article(item[1], item[0], output_path), articles)
+            used_ids = [article_id for article_id in results if article_id]
+        
+        # One write of the used-articles cache for the whole cycle
+        if used_ids:
+            self.news_fetcher.mark_as_used(used_ids)
         
-        generated_count = 0
-        targets = ["politics", "technology", "business", "sports", "entertainment"]
+        logger.info(f"[{datetime.now().strftime('%H:%M:%S')}] Cycle complete. Generated {len(used_ids)} posts.")
+        _log_buffer.flush()
+
+    def run_batch_cycle(self):
+        """Same as run_cycle, but captions for the whole cycle go out as one Batch API job"""
+        now = datetime.now()
+        date_str = now.strftime("%Y-%m-%d")
+        logger.info(f"\n[{now.strftime('%H:%M:%S')}] Starting batch generation cycle...")
+        output_path = os.path.join(OUTPUT_DIR, date_str)
+        os.makedirs(output_path, exist_ok=True)
+        
+        articles = self._fetch_articles()
+        contents = self.caption_generator.generate_content_batch([article for _, article in articles])
+        
+        # Every hook is known up front here, so render all images in one process pool
+        to_render = [(category, article) for category, article in articles if article['id'] in contents]
+        rendered = self.image_generator.generate_posts_batch([
+            (article, contents[article['id']]['hook'],
+             os.path.join(output_path, f"{self._base_filename(article, category)}.jpg"))
+            for category, article in to_render
+        ])
+        image_ready = {article['id'] for (_, article), ok in zip(to_render, rendered) if ok}
         
-        for category in targets:
-            print(f"   Searching for {category} news...")
+        used_ids = []
+        for category, article in articles:
+            article_id = self._try_process_article(article, category, output_path, contents.get(article['id']),
+                                                   image_ready=article['id'] in image_ready)
+            if article_id:
+                used_ids.append(article_id)
+        
+        if used_ids:
+            self.news_fetcher.mark_as_used(used_ids)
+        
+        logger.info(f"[{datetime.now().strftime('%H:%M:%S')}] Cycle complete. Generated {len(used_ids)} posts.")
+        _log_buffer.flush()
+
+    def _fetch_articles(self) -> List[Tuple[str, dict]]:
+        """Fetch every target category, dropping stories that show up under more than one"""
+        def fetch(category):
+            logger.info(f"   Searching for {category} news...")
             # Fetch 1 fresh article
-            articles = self.news_fetcher.fetch_by_category(category, count=1)
+            return self.news_fetcher.fetch_by_category(category, count=1)
+        
+        with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_CATEGORIES) as pool:
+            fetched = pool.map(fetch, self.TARGET_CATEGORIES)
             
-            for article in articles:
-                try:
-                    print(f"   ✨ Processing: {article['title'][:50]}...")
-                    
-                    # 1. Generate Content (Hook + Caption) FIRST
-                    content = self.caption_generator.generate_content(article)
-                    hook_text = content['hook']
-                    caption_text = content['caption']
-                    
-                    # Generate filename
-                    safe_title = "".join([c for c in article['title'] if c.isalnum() or c in (' ', '-', '_')]).rstrip()
-                    safe_title = safe_title.replace(' ', '_')[:50]
-                    base_filename = f"{category}_{safe_title}"
-                    
-                    image_path = os.path.join(output_path, f"{base_filename}.jpg")
-                    caption_path = os.path.join(output_path, f"{base_filename}.txt")
-                    
-                    # 2. Generate Image using the Hook
-                    self.image_generator.generate_post(article, hook_text, image_path)
-                    
-                    # 3. Save Caption
-                    with open(caption_path, "w", encoding="utf-8") as f:
-                        f.write(caption_text)
-                    
-                    # 4. Mark as used
-                    self.news_fetcher.mark_as_used([article['id']])
-                    
-                    print(f"      ✅ Generated: {base_filename}")
-                    print(f"         Hook: {hook_text}")
-                    generated_count += 1
-                    
-                except Exception as e:
-                    print(f"      ❌ Error processing article: {str(e)}")
-        
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] Cycle complete. Generated {generated_count} posts.")
+            # Wire stories often land in several categories; keep the first (highest priority) one
+            articles = {}
+            for category, found in zip(self.TARGET_CATEGORIES, fetched):
+                for article in found:
+                    normalized_title = _NON_WORD_RE.sub(' ', article['title'].lower()).strip()
+                    title_hash = hashlib.md5(normalized_title.encode()).hexdigest()
+                    if title_hash in articles:
+                        logger.info(f"   ⏭️  Duplicate of {articles[title_hash][0]} story, skipping: {article['title'][:50]}")
+                        continue
+                    articles[title_hash] = (category, article)
+        
+        return list(articles.values())
+
+    def _try_process_article(self, article: dict, category: str, output_path: str, content: dict = None,
+                             image_ready: bool = False) -> Optional[str]:
+        """Process one article, returning its id on success or None if it failed"""
+        try:
+            self._process_article(article, category, output_path, content, image_ready)
+            return article['id']
+        except Exception as e:
+            logger.error(f"      ❌ Error processing article: {str(e)}")
+            return None
+        finally:
+            # Write out progress as each article finishes, not only at the end of the cycle
+            _log_buffer.flush()
+
+    def _base_filename(self, article: dict, category: str) -> str:
+        """Filesystem-safe base name for an article's image and caption files"""
+        ascii_title = unicodedata.normalize('NFKD', article['title']).encode('ascii', 'ignore').decode()
+        safe_title = ascii_title.translate(_FILENAME_TRANS).rstrip().replace(' ', '_')[:50]
+        if not safe_title.strip('_-'):
+            # Non-Latin titles (CJK, Cyrillic, Arabic...) strip to nothing; keep names unique
+            safe_title = (str(article.get('id') or '').translate(_FILENAME_TRANS)[:50]
+                          or hashlib.md5(article['title'].encode()).hexdigest()[:12])
+        return f"{category}_{safe_title}"
+
+    def _process_article(self, article: dict, category: str, output_path: str, content: dict = None,
+                         image_ready: bool = False):
+        """Generate hook, caption and image for a single article (image_ready: already rendered)"""
+        logger.info(f"   ✨ Processing: {article['title'][:50]}...")
+        
+        # Generate filename
+        base_filename = self._base_filename(article, category)
+        
+        image_path = os.path.join(output_path, f"{base_filename}.jpg")
+        caption_path = os.path.join(output_path, f"{base_filename}.txt")
+        
+        # 1. Generate Content (Hook + Caption), unless a batch job already did.
+        #    The image only needs the hook, so it is rendered as soon as the hook
+        #    arrives while the caption request is still running.
+        rendered_hooks = [content['hook']] if image_ready else []
+        def render_image(hook_text):
+            self.image_generator.generate_post(article, hook_text, image_path)
+            rendered_hooks.append(hook_text)
+        
+        if content is None:
+            content = self.caption_generator.generate_content(article, on_hook=render_image)
+        hook_text = content['hook']
+        caption_text = content['caption']
+        
+        # 2. Generate Image using the Hook (cached, batch and fallback content skip the early render)
+        if hook_text not in rendered_hooks:
+            render_image(hook_text)
+        
+        # 3. Save Caption
+        with open(caption_path, "w", encoding="utf-8") as f:
+            f.write(caption_text)
+        
+        logger.info(f"      ✅ Generated: {base_filename}")
+        logger.info(f"         Hook: {hook_text}")
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--once", action="store_true", help="Run once and exit")
+    parser.add_argument("--batch", action="store_true", help="Generate captions via the OpenAI Batch API (cheaper, slower)")
     args = parser.parse_args()
     
     bot = InstagramAutomation()
+    cycle = bot.run_batch_cycle if args.batch else bot.run_cycle
     
     if args.once:
-        bot.run_cycle()
+        cycle()
     else:
         print("⏰ Scheduling active. Running every 4 hours.")
-        bot.run_cycle()
-        schedule.every(4).hours.do(bot.run_cycle)
+        cycle()
+        schedule.every(4).hours.do(cycle)
         while True:
+            # Sleep straight through to the next job instead of polling every minute
+            idle = schedule.idle_seconds()
+            if idle is None:
+                break
+            time.sleep(max(1, idle))
             schedule.run_pending()
-            time.sleep(60)
 
 if __name__ == "__main__":
     main()
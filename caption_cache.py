@@ -0,0 +1,68 @@
+"""
+Caption Cache for Modern_USA_News
+Stores generated hook/caption pairs in SQLite so reruns skip repeat API calls
+"""
+
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Optional
+from config import CACHE_DIR
+
+CACHE_DB = os.path.join(CACHE_DIR, "captions.db")
+DEFAULT_TTL = 7 * 24 * 3600  # 7 days
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the cache database, creating it on first use"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(CACHE_DB)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS captions (
+            input_hash TEXT NOT NULL,
+            prompt_version TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (input_hash, prompt_version)
+        )
+    """)
+    return conn
+
+
+def check(input_hash: str, prompt_version: str) -> Optional[Dict]:
+    """Return the cached payload, or None if missing or expired"""
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT payload, expires_at FROM captions WHERE input_hash = ? AND prompt_version = ?",
+            (input_hash, prompt_version)
+        ).fetchone()
+        
+        if row is None:
+            return None
+        
+        payload, expires_at = row
+        now = time.time()
+        if expires_at < now:
+            # Purge lazily: drop every expired entry once we trip over one
+            conn.execute("DELETE FROM captions WHERE expires_at < ?", (now,))
+            conn.commit()
+            return None
+        
+        return json.loads(payload)
+    finally:
+        conn.close()
+
+
+def save(input_hash: str, prompt_version: str, payload: Dict, ttl: int = DEFAULT_TTL):
+    """Store a payload for ttl seconds"""
+    conn = _connect()
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO captions (input_hash, prompt_version, payload, expires_at) VALUES (?, ?, ?, ?)",
+            (input_hash, prompt_version, json.dumps(payload, ensure_ascii=False), time.time() + ttl)
+        )
+        conn.commit()
+    finally:
+        conn.close()
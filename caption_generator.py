@@ -2,16 +2,70 @@
 Caption Generator using OpenRouter API
 """
 
+import os
 import requests
+import hashlib
 import json
+import logging
 import re
-from typing import Dict, Optional
-from config import OPENROUTER_API_KEY, CATEGORIES, COMMON_HASHTAGS, CHANNEL_HANDLE
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import OPENROUTER_API_KEY, OPENAI_API_KEY, CATEGORIES, CHANNEL_HANDLE, CACHE_DIR
+import caption_cache
+
+# Progress goes straight to stdout by default (cli, scripts). automation.py swaps
+# this handler for its buffered one so the cycle's output stays in order.
+logger = logging.getLogger("captions")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+if not logger.handlers:
+    _console = logging.StreamHandler(sys.stdout)
+    _console.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_console)
+
+# Bump whenever the prompt template changes so cached captions are invalidated
+PROMPT_VERSION = "v2"
+
+_JSON_FENCE_RE = re.compile(r'```json\s*|\s*```')
+_JSON_OBJ_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+
+def create_session() -> requests.Session:
+    """Build a keep-alive session with connection pooling for OpenRouter calls"""
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[500, 502, 503, 504],  # 429 is handled by CaptionGenerator
+        allowed_methods=None,     # Completions are POSTs, retry them too
+        raise_on_status=False     # Hand the final response back to the caller
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries))
+    return session
+
+
+class RateLimitError(Exception):
+    """Raised on HTTP 429; carries the server's Retry-After hint in seconds"""
+    
+    def __init__(self, retry_after: Optional[float] = None):
+        super().__init__("Rate limit exceeded (429)")
+        self.retry_after = retry_after
+
 
 class CaptionGenerator:
     """Generates engaging Instagram captions using OpenRouter/OpenAI Compatible API"""
     
     API_URL = "https://openrouter.ai/api/v1/chat/completions"
+    MODELS_URL = "https://openrouter.ai/api/v1/models"
+    MODELS_CACHE = os.path.join(CACHE_DIR, "models.json")
+    MODELS_CACHE_TTL = 3600  # 1 hour
+    RATE_LIMIT_ATTEMPTS = 3
+    RATE_LIMIT_MAX_WAIT = 30
     MODELS = [
         "google/gemini-1.5-flash",       # Paid/Limitless Tier
         "openai/gpt-4o-mini",            # Paid/Limitless Tier
@@ -20,36 +74,239 @@ class CaptionGenerator:
         "mistralai/mistral-7b-instruct:free"
     ]
     
+    # Scheduled runs can go through the OpenAI Batch API (50% cheaper, minutes of latency)
+    BATCH_API_URL = "https://api.openai.com/v1"
+    BATCH_MODEL = "gpt-4o-mini"
+    BATCH_POLL_SECONDS = 60
+    BATCH_MAX_WAIT = 2 * 3600  # Give up well before the next 4-hour cycle
+    
     def __init__(self):
         self.api_key = OPENROUTER_API_KEY
+        self._session = create_session()
+        # Hook and caption requests run side by side for every category worker
+        self._pool = ThreadPoolExecutor(max_workers=10)
         if not self.api_key:
-            print("⚠️  Warning: No OpenRouter API Key found. Captions will be basic.")
+            logger.warning("⚠️  Warning: No OpenRouter API Key found. Captions will be basic.")
+        else:
+            self.MODELS = self._filter_live_models()
 
-    def generate_content(self, article: Dict) -> Dict[str, str]:
-        category = article.get("category", "general")
-        title = article.get("title", "")
-        description = article.get("description", "") or ""
-        source = article.get("source", "")
+    def _filter_live_models(self) -> List[str]:
+        """Drop models OpenRouter no longer serves, so fallbacks never hit dead IDs"""
+        live = None
+        try:
+            if time.time() - os.path.getmtime(self.MODELS_CACHE) < self.MODELS_CACHE_TTL:
+                with open(self.MODELS_CACHE, 'r') as f:
+                    live = set(json.load(f))
+        except (OSError, ValueError):
+            pass
+        
+        if live is None:
+            try:
+                response = self._session.get(
+                    self.MODELS_URL,
+                    headers={"Authorization": f"Bearer {self.api_key}"},
+                    timeout=15
+                )
+                response.raise_for_status()
+                live = {m['id'] for m in response.json()['data']}
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                with open(self.MODELS_CACHE, 'w') as f:
+                    json.dump(sorted(live), f)
+            except Exception as e:
+                logger.warning(f"⚠️  Could not fetch OpenRouter model list, using defaults: {e}")
+                return self.MODELS
+        
+        models = [m for m in self.MODELS if m in live]
+        if not models:
+            return self.MODELS
+        if len(models) < len(self.MODELS):
+            logger.info(f"   ℹ️  Skipping unavailable models: {', '.join(m for m in self.MODELS if m not in live)}")
+        return models
+
+    def generate_content(self, article: Dict, on_hook: Optional[Callable[[str], None]] = None) -> Dict[str, str]:
+        """
+        Generate hook + caption for one article.
+        on_hook, if given, is called with the hook as soon as it arrives from the
+        model, while the longer caption is still being written. Errors raised by
+        on_hook are reported but never replace the AI content with the fallback.
+        """
+        title, description, source, category = self._article_fields(article)
         
         base_hook = title[:20].upper() + "..." if len(title) > 20 else title.upper()
         base_caption = f"📰 BREAKING: {title}\n\n{description}\n\nSource: {source}\n\n" + self._get_hashtags(category)
         
         if not self.api_key:
             return {'hook': base_hook, 'caption': base_caption}
+        
+        # Reruns and retries of the same article reuse the earlier completion
+        input_hash = self._input_hash(title, description, source, category)
+        cached = self._cache_check(input_hash)
+        if cached:
+            logger.info("   💾 Using cached caption")
+            return cached
             
-        # Try each model
-        for model in self.MODELS:
-            try:
-                print(f"   🤖 Trying AI model: {model}...")
-                return self._generate_with_ai(title, description, source, category, model)
-            except Exception as e:
-                print(f"      ⚠️  Model {model} failed: {e}")
-                continue
+        # OpenRouter walks the MODELS list server-side when a model is rate-limited or missing
+        try:
+            logger.info(f"   🤖 Requesting AI content ({self.MODELS[0]} + {len(self.MODELS) - 1} fallbacks)...")
+            content = self._generate_with_ai(title, description, source, category, on_hook)
+        except Exception as e:
+            logger.warning(f"      ⚠️  AI generation failed: {e}")
+        else:
+            self._cache_save(input_hash, content)
+            return content
         
-        print("      ❌ All models failed. Using fallback.")
+        logger.error("      ❌ All models failed. Using fallback.")
         return {'hook': base_hook, 'caption': base_caption}
 
-    def _generate_with_ai(self, title: str, description: str, source: str, category: str, model: str) -> Dict[str, str]:
+    def generate_content_batch(self, articles: List[Dict]) -> Dict[str, Dict[str, str]]:
+        """
+        Generate hook + caption for many articles through the OpenAI Batch API.
+        Half the per-token price of the live endpoint, at the cost of minutes of latency.
+        
+        Returns:
+            Dict of article id -> content. Articles missing from the result
+            should be sent through generate_content instead.
+        """
+        if not OPENAI_API_KEY:
+            logger.warning("⚠️  Warning: No OpenAI API Key found. Batch mode falls back to live requests.")
+            return {}
+        
+        results = {}
+        pending = {}
+        lines = []
+        for article in articles:
+            title, description, source, category = self._article_fields(article)
+            input_hash = self._input_hash(title, description, source, category)
+            cached = self._cache_check(input_hash)
+            if cached:
+                results[article['id']] = cached
+                continue
+            
+            system_prompt, user_prompt = self._build_prompts(title, description, source, category)
+            pending[article['id']] = (input_hash, title, category)
+            lines.append(json.dumps({
+                "custom_id": article['id'],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.BATCH_MODEL,
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    "response_format": {"type": "json_object"}
+                }
+            }))
+        
+        if not lines:
+            return results
+        
+        headers = {"Authorization": f"Bearer {OPENAI_API_KEY}"}
+        try:
+            # 1. Upload the JSONL input file
+            upload = self._session.post(
+                f"{self.BATCH_API_URL}/files",
+                headers=headers,
+                files={"file": ("captions.jsonl", "\n".join(lines).encode("utf-8"))},
+                data={"purpose": "batch"},
+                timeout=60
+            )
+            upload.raise_for_status()
+            
+            # 2. Create the batch
+            response = self._session.post(
+                f"{self.BATCH_API_URL}/batches",
+                headers=headers,
+                json={
+                    "input_file_id": upload.json()["id"],
+                    "endpoint": "/v1/chat/completions",
+                    "completion_window": "24h"
+                },
+                timeout=30
+            )
+            response.raise_for_status()
+            batch = response.json()
+            logger.info(f"   📦 Submitted batch {batch['id']} with {len(lines)} requests")
+            
+            # 3. Poll until it finishes
+            deadline = time.time() + self.BATCH_MAX_WAIT
+            while batch["status"] not in ("completed", "failed", "expired", "cancelled"):
+                if time.time() > deadline:
+                    self._session.post(f"{self.BATCH_API_URL}/batches/{batch['id']}/cancel", headers=headers, timeout=30)
+                    logger.warning(f"      ⚠️  Batch {batch['id']} still {batch['status']}, cancelled")
+                    return results
+                time.sleep(self.BATCH_POLL_SECONDS)
+                response = self._session.get(f"{self.BATCH_API_URL}/batches/{batch['id']}", headers=headers, timeout=30)
+                response.raise_for_status()
+                batch = response.json()
+            
+            if batch["status"] != "completed" or not batch.get("output_file_id"):
+                logger.warning(f"      ⚠️  Batch {batch['id']} ended as {batch['status']}")
+                return results
+            
+            # 4. Download the output and match lines back by custom_id
+            output = self._session.get(
+                f"{self.BATCH_API_URL}/files/{batch['output_file_id']}/content",
+                headers=headers,
+                timeout=60
+            )
+            output.raise_for_status()
+        except Exception as e:
+            logger.error(f"      ❌ Batch request failed: {e}")
+            return results
+        
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                input_hash, title, category = pending[item["custom_id"]]
+                body = item["response"]["body"]
+                if item["response"]["status_code"] != 200 or "error" in body:
+                    continue
+                content = self._parse_content(body['choices'][0]['message']['content'], title, category)
+                if content is None:
+                    # Left out of the results, so the caller generates it live
+                    logger.warning(f"      ⚠️  Batch answer for {item['custom_id']} lacks hook/caption, retrying live")
+                    continue
+                self._cache_save(input_hash, content)
+                results[item["custom_id"]] = content
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"      ⚠️  Skipping malformed batch result: {e}")
+        
+        logger.info(f"   ✅ Batch returned {len(results)}/{len(articles)} captions")
+        return results
+
+    def _article_fields(self, article: Dict):
+        """Pull the prompt inputs out of an article"""
+        return (
+            article.get("title", ""),
+            article.get("description", "") or "",
+            article.get("source", ""),
+            article.get("category", "general")
+        )
+
+    def _input_hash(self, title: str, description: str, source: str, category: str) -> str:
+        """Cache key for an article's prompt inputs (unit separator keeps field boundaries)"""
+        return hashlib.sha256("\x1f".join((title, description, source, category)).encode()).hexdigest()
+
+    def _cache_check(self, input_hash: str) -> Optional[Dict[str, str]]:
+        """Cached content, or None if missing or the cache is unavailable"""
+        try:
+            return caption_cache.check(input_hash, PROMPT_VERSION)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.warning(f"      ⚠️  Caption cache read failed, continuing uncached: {e}")
+            return None
+
+    def _cache_save(self, input_hash: str, content: Dict[str, str]):
+        """Store content; a cache failure never costs us the completion itself"""
+        try:
+            caption_cache.save(input_hash, PROMPT_VERSION, content)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.warning(f"      ⚠️  Caption cache write failed: {e}")
+
+    def _build_prompts(self, title: str, description: str, source: str, category: str) -> Tuple[str, str]:
+        """Build the combined JSON system and user prompts used by batch jobs"""
         system_prompt = f"You are a social media expert for '{CHANNEL_HANDLE}'. You write engaging, professional news content."
         
         user_prompt = f"""
@@ -78,6 +335,77 @@ class CaptionGenerator:
         - INCLUDE 20 highly relevant, SEO-optimized hashtags at the very end.
         """
         
+        return system_prompt, user_prompt
+
+    def _build_hook_prompt(self, title: str, description: str, category: str) -> str:
+        return f"""
+        Write a VISUAL HOOK for this news article: a short, punchy (max 6-8 words) headline to put ON the image.
+        Must be attention-grabbing but accurate. Reply with the hook text only, no quotes.
+        
+        Headline: {title}
+        Details: {description}
+        Category: {category}
+        """
+
+    def _build_caption_prompt(self, title: str, description: str, source: str, category: str) -> str:
+        return f"""
+        Write an Instagram CAPTION for this news article: a detailed, SEO-friendly summary.
+        Reply with the caption text only.
+        
+        ARTICLE:
+        Headline: {title}
+        Details: {description}
+        Source: {source}
+        Category: {category}
+        
+        CAPTION GUIDELINES:
+        - Start with a strong opening line.
+        - Write 3 short paragraphs summarizing the news in depth.
+        - Add bullet points for key details if relevant.
+        - Tone: Professional yet engaging news anchor.
+        - End with: "Source: {source} | Follow {CHANNEL_HANDLE}"
+        - INCLUDE 20 highly relevant, SEO-optimized hashtags at the very end.
+        """
+
+    def _generate_with_ai(self, title: str, description: str, source: str, category: str,
+                          on_hook: Optional[Callable[[str], None]] = None) -> Dict[str, str]:
+        system_prompt = f"You are a social media expert for '{CHANNEL_HANDLE}'. You write engaging, professional news content."
+        
+        # Decoding time grows with output length, so the short hook and the long
+        # caption go out as two requests and we only wait for the slower one
+        hook_future = self._pool.submit(
+            self._complete, system_prompt, self._build_hook_prompt(title, description, category), 20
+        )
+        caption_future = self._pool.submit(
+            self._complete, system_prompt, self._build_caption_prompt(title, description, source, category)
+        )
+        
+        hook_text = hook_future.result().strip().strip('"').upper()
+        if on_hook:
+            # A failing early render must not cost us the AI caption; the
+            # caller retries anything that didn't complete once content returns
+            try:
+                on_hook(hook_text)
+            except Exception as e:
+                logger.warning(f"      ⚠️  Early hook callback failed: {e}")
+        return {'hook': hook_text, 'caption': caption_future.result().strip()}
+
+    def _complete(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> str:
+        """Run one chat completion, backing off on rate limits before giving up"""
+        for attempt in range(self.RATE_LIMIT_ATTEMPTS):
+            try:
+                return self._request_completion(system_prompt, user_prompt, max_tokens)
+            except RateLimitError as e:
+                if attempt == self.RATE_LIMIT_ATTEMPTS - 1:
+                    raise
+                # Prefer the server's Retry-After, otherwise exponential backoff (2s, 4s, ...)
+                wait = e.retry_after if e.retry_after is not None else 2 ** (attempt + 1)
+                wait = min(wait, self.RATE_LIMIT_MAX_WAIT)
+                logger.info(f"      ⏳ Rate limited, retrying in {wait:.0f}s...")
+                time.sleep(wait)
+
+    def _request_completion(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> str:
+        """Run one chat completion and return the message text"""
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
@@ -86,18 +414,26 @@ class CaptionGenerator:
         }
         
         data = {
-            "model": model,
+            "model": self.MODELS[0],
+            "models": self.MODELS[1:],
+            "route": "fallback",
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
-            ],
-            "response_format": { "type": "json_object" }
+            ]
         }
+        if max_tokens:
+            data["max_tokens"] = max_tokens
         
-        response = requests.post(self.API_URL, headers=headers, json=data, timeout=30)
+        response = self._session.post(self.API_URL, headers=headers, json=data, timeout=30)
         
         if response.status_code == 429:
-            raise Exception("Rate limit exceeded (429)")
+            retry_after = response.headers.get("Retry-After")
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None  # HTTP-date form; fall back to our own backoff
+            raise RateLimitError(retry_after)
         if response.status_code == 404:
             raise Exception("Model not found (404)")
             
@@ -107,12 +443,25 @@ class CaptionGenerator:
         if 'error' in result_json:
             raise Exception(str(result_json['error']))
 
-        text = result_json['choices'][0]['message']['content']
-        
+        return result_json['choices'][0]['message']['content']
+
+    def _parse_content(self, text: str, title: str, category: str) -> Optional[Dict[str, str]]:
+        """
+        Parse a batch job's JSON answer, falling back to the raw text as caption.
+        Returns None for JSON that isn't an object with string hook and caption.
+        """
         try:
-            clean_text = re.sub(r'```json\s*|\s*```', '', text)
+            clean_text = _JSON_FENCE_RE.sub('', text)
+            # Models sometimes wrap the object in extra prose
+            match = _JSON_OBJ_RE.search(clean_text)
+            if match:
+                clean_text = match.group(0)
             parsed = json.loads(clean_text)
-            return parsed
+            if not (isinstance(parsed, dict)
+                    and isinstance(parsed.get('hook'), str) and parsed['hook'].strip()
+                    and isinstance(parsed.get('caption'), str) and parsed['caption'].strip()):
+                return None
+            return {'hook': parsed['hook'], 'caption': parsed['caption']}
         except json.JSONDecodeError:
             return {
                 'hook': title[:20].upper() + "...",
@@ -120,9 +469,7 @@ class CaptionGenerator:
             }
 
     def _get_hashtags(self, category: str) -> str:
-        cat_tags = CATEGORIES.get(category, {}).get("hashtags", [])
-        all_tags = cat_tags + COMMON_HASHTAGS
-        return " ".join(list(set(all_tags)))
+        return CATEGORIES.get(category, CATEGORIES["general"])["hashtags_str"]
 
 # Test
 if __name__ == "__main__":
@@ -1,16 +1,17 @@
 
-import requests
 import os
 from dotenv import load_dotenv
+from caption_generator import create_session
 
 load_dotenv()
 key = os.getenv("OPENROUTER_API_KEY")
 
-def list_models():
+def list_models(session=None):
+    session = session or create_session()
     url = "https://openrouter.ai/api/v1/models"
     headers = {"Authorization": f"Bearer {key}"}
     try:
-        r = requests.get(url, headers=headers)
+        r = session.get(url, headers=headers)
         if r.status_code == 200:
             models = r.json()['data']
             print(f"Found {len(models)} models.")
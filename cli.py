@@ -119,16 +119,19 @@ def generate_posts(count: int = 5):
         # Clear today's folder
         output.clear_today()
         
+        # Generate content for all stories concurrently
+        contents = writer.generate_content_batch(top_stories)
+        
         success_count = 0
-        for i, article in enumerate(top_stories, 1):
+        for i, (article, content) in enumerate(zip(top_stories, contents), 1):
             try:
                 print(f"\n[{i}/{len(top_stories)}] {article['title'][:60]}...")
                 
-                # Generate content
-                content = writer.generate_content(article)
+                if content is None:
+                    raise RuntimeError("content generation failed")
                 
                 # Apply content safety
-                cleaned_content, issues = safety.validate_and_clean(content)
+                cleaned_content, issues, _ = safety.validate_and_clean(content)
                 
                 if issues:
                     print(f"   ⚠️ Safety issues: {len(issues)}")
@@ -11,6 +11,8 @@ load_dotenv()
 # API Keys
 NEWS_API_KEY = os.getenv("NEWS_API_KEY", "")
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")  # Optional: only used by --batch
+FAL_KEY = os.getenv("FAL_KEY", "")  # Optional: AI-generated post backgrounds via fal.ai
 
 # Channel Configuration
 CHANNEL_NAME = os.getenv("CHANNEL_NAME", "Modern_USA_News")
@@ -111,6 +113,10 @@ COMMON_HASHTAGS = [
     "#UnitedStates"
 ]
 
+# Pre-joined caption hashtags per category (order-preserving dedup keeps output stable)
+for _style in CATEGORIES.values():
+    _style["hashtags_str"] = " ".join(dict.fromkeys(_style["hashtags"] + COMMON_HASHTAGS))
+
 # Fonts
 FONTS = {
     "headline": "arial.ttf",
@@ -123,3 +129,8 @@ FONTS = {
 OUTPUT_DIR = "output"
 LOGS_DIR = "logs"
 CACHE_DIR = "cache"
+
+# Dashboard: when served behind nginx, images are handed off via X-Accel-Redirect
+# to this internal location (e.g. "/protected_output"); empty = Flask serves them.
+#   location /protected_output/ { internal; alias /path/to/output/; }
+DASHBOARD_ACCEL_PREFIX = os.getenv("DASHBOARD_ACCEL_PREFIX", "")
@@ -3,9 +3,48 @@ Content Safety Module for Modern_USA_News
 Filters profanity, validates content, and ensures quality standards
 """
 
+import logging
 import re
+from collections import Counter
 from typing import Dict, List, Tuple, Optional
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Codepoint ranges stripped by ContentSafety._remove_emojis
+_EMOJI_RANGES = (
+    (0x1F600, 0x1F64F),  # emoticons
+    (0x1F300, 0x1F5FF),  # symbols & pictographs
+    (0x1F680, 0x1F6FF),  # transport & map symbols
+    (0x1F1E0, 0x1F1FF),  # flags
+    (0x2702, 0x27B0),
+    (0x24C2, 0x1F251),
+)
+
+_EMOJI_MIN = chr(min(lo for lo, _ in _EMOJI_RANGES))
+
+# Words left lowercase by ContentSafety._title_case (unless first)
+_SMALL_WORDS = frozenset({'a', 'an', 'the', 'and', 'but', 'or', 'for', 'nor',
+                          'on', 'at', 'to', 'by', 'in', 'of'})
+
+
+class _EmojiTable(dict):
+    """str.translate table that fills itself in as new codepoints are seen"""
+    
+    def __missing__(self, codepoint: int):
+        value = None if any(lo <= codepoint <= hi for lo, hi in _EMOJI_RANGES) else codepoint
+        self[codepoint] = value
+        return value
+
+
+_EMOJI_TABLE = _EmojiTable()
+
 
 class ContentSafety:
     """
@@ -49,6 +88,48 @@ class ContentSafety:
         'anonymous source', 'insider says', 'leaked information'
     ]
     
+    # Neutral alternatives for sensational words in headlines/summaries
+    SENSATIONAL_REPLACEMENTS = {
+        'shocking': 'notable',
+        'unbelievable': 'significant',
+        'insane': 'notable',
+        'crazy': 'unusual',
+        'explosive': 'significant',
+        'bombshell': 'major',
+        'devastating': 'significant',
+        'slam': 'criticize',
+        'slammed': 'criticized',
+        'blasted': 'criticized',
+        'ripped': 'criticized',
+        'demolished': 'challenged',
+        'crushed': 'defeated',
+        'epic': 'major'
+    }
+    
+    # Captions keep some engagement language but soften extremes
+    SOFTENING = {
+        'destroyed': 'criticized',
+        'annihilated': 'defeated',
+        'obliterated': 'overcame',
+        'nightmare': 'difficult situation',
+        'catastrophic': 'serious',
+        'horrific': 'concerning',
+        'terrifying': 'concerning'
+    }
+    
+    # Patterns compiled once at import instead of on every call
+    _PROFANITY_RE = re.compile('|'.join(f'(?:{p})' for p in PROFANITY_PATTERNS), re.IGNORECASE)
+    _SOFTENING_RE = re.compile(r'\b(' + '|'.join(map(re.escape, SOFTENING)) + r')\b', re.IGNORECASE)
+    _HASHTAG_RE = re.compile(r'#\w+')
+    # Every sensational word gets its own named group (s0, s1, ...) so a match's
+    # lastgroup maps straight to its (word, replacement) pair
+    _SENSATIONAL_GROUPS = {f's{i}': pair for i, pair in enumerate(SENSATIONAL_REPLACEMENTS.items())}
+    _HEADLINE_RE = re.compile(
+        f"(?P<prof>{_PROFANITY_RE.pattern})"
+        r"|\b(?:" + "|".join(f"(?P<{group}>{re.escape(word)})" for group, (word, _) in _SENSATIONAL_GROUPS.items()) + r")\b",
+        re.IGNORECASE
+    )
+    
     # Quality thresholds
     MIN_HEADLINE_WORDS = 3
     MAX_HEADLINE_WORDS = 12
@@ -58,241 +139,183 @@ class ContentSafety:
     MAX_CAPTION_LENGTH = 2200  # Instagram limit
     
     def __init__(self):
-        self.issues = []
-        self.modifications = []
-        print("🛡️ Content Safety module initialized")
+        logger.debug("🛡️ Content Safety module initialized")
     
-    def validate_and_clean(self, content: Dict[str, str]) -> Tuple[Dict[str, str], List[str]]:
+    def validate_and_clean(self, content: Dict[str, str]) -> Tuple[Dict[str, str], List[str], List[str]]:
         """
-        Validate and clean content
+        Validate and clean content.
+        Keeps no per-call state, so one instance can be shared across threads.
         
         Args:
             content: Dict with 'headline', 'image_summary', 'caption', 'hashtags'
             
         Returns:
-            Tuple of (cleaned_content, issues_found)
+            Tuple of (cleaned_content, issues_found, modifications_made)
         """
-        self.issues = []
-        self.modifications = []
+        issues = []
+        modifications = []
         
         cleaned = content.copy()
         
         # Clean each field
         if 'headline' in cleaned:
-            cleaned['headline'] = self._clean_headline(cleaned['headline'])
+            cleaned['headline'] = self._clean_headline(cleaned['headline'], issues, modifications)
         
         if 'image_summary' in cleaned:
-            cleaned['image_summary'] = self._clean_summary(cleaned['image_summary'])
+            cleaned['image_summary'] = self._clean_summary(cleaned['image_summary'], modifications)
         
         if 'caption' in cleaned:
-            cleaned['caption'] = self._clean_caption(cleaned['caption'])
+            cleaned['caption'] = self._clean_caption(cleaned['caption'], issues, modifications)
         
         if 'hashtags' in cleaned:
-            cleaned['hashtags'] = self._clean_hashtags(cleaned['hashtags'])
+            cleaned['hashtags'] = self._clean_hashtags(cleaned['hashtags'], modifications)
         
-        return cleaned, self.issues
+        return cleaned, issues, modifications
     
-    def _clean_headline(self, text: str) -> str:
+    def _clean_headline(self, text: str, issues: List[str], modifications: List[str]) -> str:
         """Clean and validate headline"""
-        # Remove profanity
-        text = self._filter_profanity(text)
-        
-        # Remove sensationalist language
-        text = self._filter_sensational(text)
+        # Remove profanity, sensationalist language and emojis
+        text = self._scrub(text, modifications)
         
         # Check word count
         words = text.split()
         if len(words) < self.MIN_HEADLINE_WORDS:
-            self.issues.append(f"Headline too short: {len(words)} words")
+            issues.append(f"Headline too short: {len(words)} words")
         elif len(words) > self.MAX_HEADLINE_WORDS:
-            text = ' '.join(words[:self.MAX_HEADLINE_WORDS])
-            self.modifications.append("Headline truncated to 12 words")
-        
-        # Remove emojis from headline
-        text = self._remove_emojis(text)
+            words = words[:self.MAX_HEADLINE_WORDS]
+            modifications.append("Headline truncated to 12 words")
         
         # Capitalize properly
-        text = self._title_case(text)
-        
-        return text.strip()
+        return self._title_case(words)
     
-    def _clean_summary(self, text: str) -> str:
+    def _clean_summary(self, text: str, modifications: List[str]) -> str:
         """Clean and validate image summary"""
-        # Remove profanity
-        text = self._filter_profanity(text)
-        
-        # Remove sensational language
-        text = self._filter_sensational(text)
+        # Remove profanity, sensational language and emojis
+        text = self._scrub(text, modifications)
         
         # Check word count
         words = text.split()
         if len(words) > self.MAX_SUMMARY_WORDS:
             text = ' '.join(words[:self.MAX_SUMMARY_WORDS])
-            self.modifications.append("Summary truncated to 22 words")
+            modifications.append("Summary truncated to 22 words")
         
-        # Remove emojis
+        return text.strip()
+    
+    def _scrub(self, text: str, modifications: List[str]) -> str:
+        """Profanity and sensational-word filtering in one regex pass, then emoji removal"""
+        profanity = 0
+        replaced = Counter()
+        
+        def replace(match):
+            nonlocal profanity
+            group = match.lastgroup
+            if group == 'prof':
+                profanity += 1
+                return '***'
+            word, replacement = self._SENSATIONAL_GROUPS[group]
+            replaced[word] += 1
+            return replacement
+        
+        text = self._HEADLINE_RE.sub(replace, text)
+        # Emojis go through the translate table (skipped when none are present)
         text = self._remove_emojis(text)
         
-        return text.strip()
+        # One summary line per kind of change rather than one per match
+        if profanity:
+            modifications.append(f"Removed {profanity} profanity match(es)")
+        for word, count in replaced.items():
+            suffix = f" ({count}x)" if count > 1 else ""
+            modifications.append(f"Replaced '{word}' with '{self.SENSATIONAL_REPLACEMENTS[word]}'{suffix}")
+        
+        return text
     
-    def _clean_caption(self, text: str) -> str:
+    def _clean_caption(self, text: str, issues: List[str], modifications: List[str]) -> str:
         """Clean and validate caption"""
         # Remove profanity
-        text = self._filter_profanity(text)
+        text = self._filter_profanity(text, modifications)
         
         # Remove sensational language (but keep some in captions for engagement)
         text = self._soften_language(text)
         
-        # Flag speculation
-        self._check_speculation(text)
-        
-        # Check bias
-        self._check_bias(text)
+        # Flag speculation and bias (one scan for both word lists)
+        markers = self._find_markers(text)
+        self._check_speculation(markers, issues)
+        self._check_bias(markers, issues)
         
         # Validate length
         if len(text) > self.MAX_CAPTION_LENGTH:
             # Truncate at sentence boundary
             text = self._truncate_at_sentence(text, self.MAX_CAPTION_LENGTH)
-            self.modifications.append("Caption truncated to fit Instagram limit")
+            modifications.append("Caption truncated to fit Instagram limit")
         
         # Validate word count
         words = text.split()
         if len(words) < self.MIN_CAPTION_WORDS:
-            self.issues.append(f"Caption may be too short: {len(words)} words")
+            issues.append(f"Caption may be too short: {len(words)} words")
         
         return text.strip()
     
-    def _clean_hashtags(self, text: str) -> str:
+    def _clean_hashtags(self, text: str, modifications: List[str]) -> str:
         """Clean and validate hashtags"""
-        # Split into individual hashtags
-        hashtags = re.findall(r'#\w+', text)
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_hashtags = []
-        for tag in hashtags:
-            tag_lower = tag.lower()
-            if tag_lower not in seen:
-                seen.add(tag_lower)
-                unique_hashtags.append(tag)
+        # Remove duplicates (case-insensitive) while preserving order and first-seen casing
+        seen = {}
+        for tag in self._HASHTAG_RE.findall(text):
+            seen.setdefault(tag.lower(), tag)
+        unique_hashtags = list(seen.values())
         
         # Limit to 30 hashtags (Instagram limit)
         if len(unique_hashtags) > 30:
             unique_hashtags = unique_hashtags[:30]
-            self.modifications.append("Hashtags limited to 30")
+            modifications.append("Hashtags limited to 30")
         
         return ' '.join(unique_hashtags)
     
-    def _filter_profanity(self, text: str) -> str:
+    def _filter_profanity(self, text: str, modifications: List[str]) -> str:
         """Remove profanity from text"""
-        original = text
-        
-        for pattern in self.PROFANITY_PATTERNS:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                text = re.sub(pattern, '***', text, flags=re.IGNORECASE)
-                self.modifications.append(f"Removed profanity: {matches[0]}")
-        
-        return text
-    
-    def _filter_sensational(self, text: str) -> str:
-        """Remove sensationalist language"""
-        text_lower = text.lower()
-        
-        for word in self.SENSATIONAL_WORDS:
-            if word in text_lower:
-                # Replace with neutral alternatives
-                replacements = {
-                    'shocking': 'notable',
-                    'unbelievable': 'significant',
-                    'insane': 'notable',
-                    'crazy': 'unusual',
-                    'explosive': 'significant',
-                    'bombshell': 'major',
-                    'devastating': 'significant',
-                    'slam': 'criticize',
-                    'slammed': 'criticized',
-                    'blasted': 'criticized',
-                    'ripped': 'criticized',
-                    'demolished': 'challenged',
-                    'crushed': 'defeated',
-                    'epic': 'major'
-                }
-                
-                replacement = replacements.get(word, '')
-                if replacement:
-                    text = re.sub(rf'\b{word}\b', replacement, text, flags=re.IGNORECASE)
-                    self.modifications.append(f"Replaced '{word}' with '{replacement}'")
-        
+        # One scan over all patterns
+        text, count = self._PROFANITY_RE.subn('***', text)
+        if count:
+            modifications.append(f"Removed {count} profanity match(es)")
         return text
     
     def _soften_language(self, text: str) -> str:
         """Soften overly aggressive language in captions"""
-        # Allow some engagement language but soften extremes
-        softening = {
-            'destroyed': 'criticized',
-            'annihilated': 'defeated',
-            'obliterated': 'overcame',
-            'nightmare': 'difficult situation',
-            'catastrophic': 'serious',
-            'horrific': 'concerning',
-            'terrifying': 'concerning'
-        }
-        
-        for strong, soft in softening.items():
-            if strong in text.lower():
-                text = re.sub(rf'\b{strong}\b', soft, text, flags=re.IGNORECASE)
-        
-        return text
+        return self._SOFTENING_RE.sub(lambda match: self.SOFTENING[match.group(1).lower()], text)
     
-    def _check_speculation(self, text: str):
-        """Flag speculation markers"""
+    def _find_markers(self, text: str) -> set:
+        """Return every speculation marker / biased word contained in text"""
         text_lower = text.lower()
         
+        if _MARKER_AUTOMATON is not None:
+            return {word for _, word in _MARKER_AUTOMATON.iter(text_lower)}
+        return {word for word in self.SPECULATION_MARKERS + self.BIASED_WORDS if word in text_lower}
+    
+    def _check_speculation(self, markers: set, issues: List[str]):
+        """Flag speculation markers"""
         for marker in self.SPECULATION_MARKERS:
-            if marker in text_lower:
-                self.issues.append(f"Contains speculation marker: '{marker}'")
+            if marker in markers:
+                issues.append(f"Contains speculation marker: '{marker}'")
     
-    def _check_bias(self, text: str):
+    def _check_bias(self, markers: set, issues: List[str]):
         """Check for biased language"""
-        text_lower = text.lower()
-        
-        found_bias = []
-        for word in self.BIASED_WORDS:
-            if word in text_lower:
-                found_bias.append(word)
+        found_bias = [word for word in self.BIASED_WORDS if word in markers]
         
         if found_bias:
-            self.issues.append(f"May contain biased language: {', '.join(found_bias[:3])}")
+            issues.append(f"May contain biased language: {', '.join(found_bias[:3])}")
     
     def _remove_emojis(self, text: str) -> str:
         """Remove emojis from text (for headlines/summaries) """
-        # Emoji regex pattern
-        emoji_pattern = re.compile(
-            "["
-            "\U0001F600-\U0001F64F"  # emoticons
-            "\U0001F300-\U0001F5FF"  # symbols & pictographs
-            "\U0001F680-\U0001F6FF"  # transport & map symbols
-            "\U0001F1E0-\U0001F1FF"  # flags
-            "\U00002702-\U000027B0"
-            "\U000024C2-\U0001F251"
-            "]+", flags=re.UNICODE
-        )
-        return emoji_pattern.sub('', text)
-    
-    def _title_case(self, text: str) -> str:
+        # Most text has no emoji at all; max() is a single C-level scan
+        if max(text, default='\0') < _EMOJI_MIN:
+            return text
+        return text.translate(_EMOJI_TABLE)
+    
+    def _title_case(self, words: List[str]) -> str:
         """Proper title case (not capitalizing small words) """
-        small_words = {'a', 'an', 'the', 'and', 'but', 'or', 'for', 'nor', 
-                       'on', 'at', 'to', 'by', 'in', 'of'}
-        
-        words = text.split()
         result = []
-        
         for i, word in enumerate(words):
-            if i == 0 or word.lower() not in small_words:
-                result.append(word.capitalize())
-            else:
-                result.append(word.lower())
+            lower = word.lower()
+            result.append(word.capitalize() if i == 0 or lower not in _SMALL_WORDS else lower)
         
         return ' '.join(result)
     
@@ -304,11 +327,11 @@ class ContentSafety:
         # Find sentence boundaries within limit
         truncated = text[:max_length]
         
-        # Find last sentence end
-        for punct in ['.', '!', '?']:
-            last_punct = truncated.rfind(punct)
-            if last_punct > max_length * 0.7:  # At least 70% of max
-                return truncated[:last_punct + 1]
+        # Find last sentence end, only looking past 70% of max
+        min_end = int(max_length * 0.7) + 1
+        last_punct = max(truncated.rfind(punct, min_end) for punct in '.!?')
+        if last_punct != -1:
+            return truncated[:last_punct + 1]
         
         # Fallback: truncate at word boundary
         last_space = truncated.rfind(' ')
@@ -317,14 +340,14 @@ class ContentSafety:
         
         return truncated
     
-    def get_quality_score(self, content: Dict[str, str]) -> int:
+    def get_quality_score(self, content: Dict[str, str], issues: List[str]) -> int:
         """
         Calculate quality score (0-100)
         """
         score = 100
         
         # Deduct for issues
-        score -= len(self.issues) * 5
+        score -= len(issues) * 5
         
         # Check headline quality
         headline = content.get('headline', '')
@@ -342,29 +365,43 @@ class ContentSafety:
         
         return max(0, min(100, score))
     
-    def generate_report(self) -> str:
+    def generate_report(self, issues: List[str], modifications: List[str]) -> str:
         """Generate content safety report"""
         report = []
         report.append("=" * 40)
         report.append("CONTENT SAFETY REPORT")
         report.append("=" * 40)
         
-        if self.issues:
+        if issues:
             report.append("\n⚠️ Issues Found:")
-            for issue in self.issues:
+            for issue in issues:
                 report.append(f"  - {issue}")
         else:
             report.append("\n✅ No issues found")
         
-        if self.modifications:
+        if modifications:
             report.append("\n🔧 Modifications Made:")
-            for mod in self.modifications:
+            for mod in modifications:
                 report.append(f"  - {mod}")
         
         report.append("=" * 40)
         return '\n'.join(report)
 
 
+def _build_marker_automaton():
+    """Aho-Corasick automaton over the speculation + bias lists (None without pyahocorasick)"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word in ContentSafety.SPECULATION_MARKERS + ContentSafety.BIASED_WORDS:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
+_MARKER_AUTOMATON = _build_marker_automaton()
+
+
 # Singleton instance
 _safety_instance = None
 
@@ -404,12 +441,12 @@ if __name__ == "__main__":
     print(f"  Headline: {test_content['headline']}")
     print(f"  Summary: {test_content['image_summary'][:60]}...")
     
-    cleaned, issues = safety.validate_and_clean(test_content)
+    cleaned, issues, modifications = safety.validate_and_clean(test_content)
     
-    print("\n" + safety.generate_report())
+    print("\n" + safety.generate_report(issues, modifications))
     
     print("\nCleaned Content:")
     print(f"  Headline: {cleaned['headline']}")
     print(f"  Summary: {cleaned['image_summary'][:60]}...")
     
-    print(f"\n📊 Quality Score: {safety.get_quality_score(cleaned)}/100")
+    print(f"\n📊 Quality Score: {safety.get_quality_score(cleaned, issues)}/100")
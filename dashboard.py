@@ -2,9 +2,11 @@
 Web Dashboard for reviewing generated Instagram posts
 """
 
-from flask import Flask, render_template, send_from_directory, request, redirect, url_for
+from flask import Flask, Response, abort, render_template, send_from_directory, request, redirect, url_for
+from werkzeug.security import safe_join
+import mimetypes
 import os
-from config import OUTPUT_DIR
+from config import OUTPUT_DIR, DASHBOARD_ACCEL_PREFIX
 
 app = Flask(__name__)
 
@@ -12,10 +14,51 @@ app = Flask(__name__)
 if not os.path.exists(OUTPUT_DIR):
     os.makedirs(OUTPUT_DIR)
 
+# date -> (per-file (name, mtime_ns, size) set, posts); any add, delete or in-place rewrite changes the key
+_POST_CACHE = {}
+
+def _load_posts(selected_date, date_path):
+    """Pair up the images and captions of one date, reusing the last result if nothing changed"""
+    # One directory pass gives both the cache key and the jpg/txt grouping
+    with os.scandir(date_path) as it:
+        entries = [(entry.name, entry.path, entry.stat()) for entry in it]
+    key = frozenset((name, st.st_mtime_ns, st.st_size) for name, _, st in entries)
+    cached = _POST_CACHE.get(selected_date)
+    if cached and cached[0] == key:
+        return cached[1]
+    
+    # Group jpg and txt files by base name
+    images = {}
+    captions = {}
+    for name, path, _ in entries:
+        base_name, ext = os.path.splitext(name)
+        if ext == '.jpg':
+            images[base_name] = name
+        elif ext == '.txt':
+            captions[base_name] = path
+    
+    posts = []
+    for base_name in sorted(images):
+        caption = ""
+        if base_name in captions:
+            with open(captions[base_name], 'r', encoding='utf-8') as f:
+                caption = f.read()
+        
+        posts.append({
+            'image': images[base_name],
+            'caption': caption,
+            'date': selected_date,
+            'base_name': base_name
+        })
+    
+    _POST_CACHE[selected_date] = (key, posts)
+    return posts
+
 @app.route('/')
 def index():
     # List all dates (folders)
-    dates = sorted([d for d in os.listdir(OUTPUT_DIR) if os.path.isdir(os.path.join(OUTPUT_DIR, d))], reverse=True)
+    with os.scandir(OUTPUT_DIR) as it:
+        dates = sorted((e.name for e in it if e.is_dir()), reverse=True)
     
     selected_date = request.args.get('date')
     if not selected_date and dates:
@@ -25,30 +68,20 @@ def index():
     if selected_date:
         date_path = os.path.join(OUTPUT_DIR, selected_date)
         if os.path.exists(date_path):
-            files = sorted(os.listdir(date_path))
-            # Group jpg and txt files
-            images = [f for f in files if f.endswith('.jpg')]
-            
-            for img in images:
-                base_name = os.path.splitext(img)[0]
-                txt_file = base_name + '.txt'
-                
-                caption = ""
-                if txt_file in files:
-                    with open(os.path.join(date_path, txt_file), 'r', encoding='utf-8') as f:
-                        caption = f.read()
-                
-                posts.append({
-                    'image': img,
-                    'caption': caption,
-                    'date': selected_date,
-                    'base_name': base_name
-                })
+            posts = _load_posts(selected_date, date_path)
     
     return render_template('dashboard.html', dates=dates, selected_date=selected_date, posts=posts)
 
 @app.route('/image/<date>/<filename>')
 def serve_image(date, filename):
+    if DASHBOARD_ACCEL_PREFIX and not app.debug:
+        # Let the reverse proxy send the file with sendfile(); Flask only checks the path
+        accel_path = safe_join(DASHBOARD_ACCEL_PREFIX, date, filename)
+        if accel_path is None:
+            abort(404)
+        response = Response(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = accel_path
+        return response
     return send_from_directory(os.path.join(OUTPUT_DIR, date), filename)
 
 @app.route('/delete/<date>/<filename>')
@@ -63,6 +96,7 @@ def delete_post(date, filename):
         os.remove(jpg_path)
     if os.path.exists(txt_path):
         os.remove(txt_path)
+    _POST_CACHE.pop(date, None)
         
     return redirect(url_for('index', date=date))
 
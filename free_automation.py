@@ -14,10 +14,13 @@ Features:
 - Date-based output organization
 """
 
-import time
 import schedule
 import sys
 import os
+import re
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from datetime import datetime
 
 # Add project root to path
@@ -27,7 +30,7 @@ from rss_collector import RSSCollector
 from news_ranker import NewsRanker
 from free_llm_writer import FreeContentGenerator
 from output_manager import OutputManager
-from image_generator_pil import FreeImageGenerator
+from image_generator_pil import FreeImageGenerator, init_carousel_worker, render_carousel
 from content_safety import get_safety
 from logger import get_logger, safe_execute
 from rss_config import COLLECTION_INTERVAL_HOURS, MAX_STORIES_PER_DAY
@@ -35,6 +38,10 @@ from rss_config import COLLECTION_INTERVAL_HOURS, MAX_STORIES_PER_DAY
 # Feature Flags
 ENABLE_REELS = False  # Keep disabled by default as requested
 
+# Carousel sentiment keywords (substring match, same as the old word lists)
+_POSITIVE_RE = re.compile(r'success|breakthrough|positive|good', re.I)
+_SERIOUS_RE = re.compile(r'killing|tragedy|death|crash|police', re.I)
+
 
 class NewsAutomation:
     """
@@ -42,6 +49,10 @@ class NewsAutomation:
     Coordinates all modules for daily news content generation
     """
     
+    # Articles whose text is generated concurrently / concurrent Ollama requests
+    MAX_CONTENT_WORKERS = 4
+    MAX_LLM_REQUESTS = 2
+    
     def __init__(self):
         self.logger = get_logger()
         
@@ -55,6 +66,10 @@ class NewsAutomation:
         self.image_gen = self._init_module("Image Generator", FreeImageGenerator)
         self.safety = get_safety()
         
+        self._llm_slots = threading.BoundedSemaphore(self.MAX_LLM_REQUESTS)
+        self._save_lock = threading.Lock()
+        self._stop = threading.Event()
+        
         self._print_banner()
     
     def _init_module(self, name: str, module_class):
@@ -87,6 +102,13 @@ class NewsAutomation:
         # Save state for recovery
         self.logger.save_recovery_state({'stage': 'started', 'time': datetime.now().isoformat()})
         
+        # Load the Ollama model in the background while RSS collection runs
+        # (it is evicted between daily cycles, so this happens every cycle)
+        preload_thread = None
+        if self.writer:
+            preload_thread = threading.Thread(target=self.writer.preload, daemon=True)
+            preload_thread.start()
+        
         try:
             # Step 1: Collect news
             self.logger.step(1, "Collecting RSS feeds")
@@ -97,10 +119,6 @@ class NewsAutomation:
             else:
                 self.logger.warning("RSS Collector not available, skipping collection")
             
-            # Warm up Ollama models before processing batch
-            if self.writer:
-                self.writer.warmup_ollama()
-            
             # Step 2: Rank and select stories
             self.logger.step(2, f"Selecting top {MAX_STORIES_PER_DAY} stories")
             if not self.ranker:
@@ -123,43 +141,72 @@ class NewsAutomation:
                 self.logger.error("Writer or Output Manager not available")
                 return False
             
+            # Make sure the model preload has finished before the first request
+            if preload_thread:
+                preload_thread.join()
+            
             # Clear today's folder
             self.output.clear_today()
             
             generated_posts = []
-            for i, article in enumerate(top_stories, 1):
-                try:
-                    self.logger.info(f"\n   [{i}/{len(top_stories)}] Processing: {article['title'][:55]}...")
-                    
-                    # Generate content
-                    content = self.writer.generate_content(article)
-                    
-                    # Apply content safety
-                    cleaned_content, issues = self.safety.validate_and_clean(content)
-                    
-                    if issues:
-                        self.logger.debug(f"Safety issues for article {i}: {issues}")
-                    
-                    # Save technical text files
-                    files = self.output.save_post(article, cleaned_content, i)
+            
+            # Text generation runs in a thread pool (Ollama/HTTP bound); each
+            # finished article's carousel is handed to a process pool so slide
+            # rendering (CPU bound) overlaps the remaining LLM work
+            render_pool = None
+            if self.image_gen:
+                render_pool = ProcessPoolExecutor(
+                    max_workers=min(len(top_stories), max(2, (os.cpu_count() or 2) - 1)),
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=init_carousel_worker,
+                    initargs=(self.image_gen.output_dir,)
+                )
+            
+            try:
+                carousels = {}
+                with ThreadPoolExecutor(max_workers=self.MAX_CONTENT_WORKERS) as pool:
+                    futures = {
+                        pool.submit(self._generate_and_clean, i, article, len(top_stories)): (i, article)
+                        for i, article in enumerate(top_stories, 1)
+                    }
                     
-                    # Generate Visual Carousel (Viral Carousel Engine)
-                    self.logger.info(f"      🎨 Generating 4-slide carousel (Glassmorphism style)...")
-                    try:
-                        # Sentiment check (simplified)
-                        sentiment = "Neutral"
-                        text_blob = (article['title'] + " " + article.get('description', '')).lower()
-                        if any(w in text_blob for w in ['success', 'breakthrough', 'positive', 'good']):
-                            sentiment = "Positive"
-                        elif any(w in text_blob for w in ['killing', 'tragedy', 'death', 'crash', 'police']):
-                            sentiment = "Serious"
+                    for future in as_completed(futures):
+                        i, article = futures[future]
+                        try:
+                            cleaned_content, files = future.result()
+                        except Exception as e:
+                            self.logger.error(f"Failed to process article {i}", exc=e)
+                            continue
+                        
+                        carousel = None
+                        if render_pool:
+                            # Generate Visual Carousel (Viral Carousel Engine)
+                            self.logger.info("      🎨 Generating 4-slide carousel for post #%d (Glassmorphism style)...", i)
                             
-                        image_paths = self.image_gen.generate_carousel(
-                            slides=cleaned_content.get('slides', []),
-                            category=cleaned_content.get('category', 'General'),
-                            post_number=i,
-                            sentiment=sentiment
-                        )
+                            # Sentiment check (simplified)
+                            text_blob = article['title'] + " " + article.get('description', '')
+                            if _POSITIVE_RE.search(text_blob):
+                                sentiment = "Positive"
+                            elif _SERIOUS_RE.search(text_blob):
+                                sentiment = "Serious"
+                            else:
+                                sentiment = "Neutral"
+                            
+                            carousel = render_pool.submit(
+                                render_carousel,
+                                post_number=i,
+                                slides=cleaned_content.get('slides', []),
+                                category=cleaned_content.get('category', 'General'),
+                                sentiment=sentiment
+                            )
+                        carousels[i] = (carousel, cleaned_content, files)
+                
+                for i in sorted(carousels):
+                    carousel, cleaned_content, files = carousels[i]
+                    try:
+                        if carousel is None:
+                            raise RuntimeError("Image Generator not available")
+                        image_paths = carousel.result()
                         self.output.save_carousel_images(i, image_paths)
                     except Exception as visual_err:
                         self.logger.error(f"      ⚠️ Carousel failed, but text files saved", exc=visual_err)
@@ -182,12 +229,9 @@ class NewsAutomation:
                     
                     self.logger.success(f"Post #{i}: Ready with Carousel & Prompts")
                     self.logger.update_stat('posts_generated')
-                    
-                    time.sleep(1.0)  # Moderate pause for stability
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to process article {i}", exc=e)
-                    continue
+            finally:
+                if render_pool:
+                    render_pool.shutdown()
             
             # Step 4: Final Summary
             self.logger.step(4, "All Content Ready")
@@ -199,8 +243,9 @@ class NewsAutomation:
             self.logger.step(5, "Creating daily report")
             report = self.output.create_daily_report()
             
-            # Step 6: Archive old folders
-            self.output.archive_old_folders(keep_days=7)
+            # Step 6: Archive old folders (in the background; nothing below depends on it)
+            threading.Thread(target=self.output.archive_old_folders,
+                             kwargs={'keep_days': 7}, daemon=True).start()
             
             # Clear recovery state on success
             self.logger.clear_recovery_state()
@@ -221,6 +266,26 @@ class NewsAutomation:
             self.logger.save_recovery_state({'stage': 'failed', 'error': str(e)})
             return False
     
+    def _generate_and_clean(self, i: int, article: dict, total: int):
+        """Generate, safety-check and save the text content of one post (runs in a worker thread)"""
+        self.logger.info("\n   [%d/%d] Processing: %.55s...", i, total, article['title'])
+        
+        # Generate content (a couple of requests at a time so Ollama isn't swamped)
+        with self._llm_slots:
+            content = self.writer.generate_content(article)
+        
+        # Apply content safety
+        cleaned_content, issues, _ = self.safety.validate_and_clean(content)
+        
+        if issues:
+            self.logger.debug("Safety issues for article %d: %s", i, issues)
+        
+        # Save technical text files (all posts share today_dir)
+        with self._save_lock:
+            files = self.output.save_post(article, cleaned_content, i)
+        
+        return cleaned_content, files
+    
     @safe_execute(fallback_value=None)
     def run_collection_only(self):
         """Just collect news (runs periodically)"""
@@ -247,18 +312,27 @@ class NewsAutomation:
         # Schedule daily content generation
         schedule.every().day.at("06:00").do(self.run_daily_cycle)
         
-        # Run scheduler loop
-        while True:
+        # Run scheduler loop: sleep until the next job is due (or stop() is called)
+        while not self._stop.is_set():
             try:
+                idle = schedule.idle_seconds()
+                if idle is None:
+                    idle = 3600
+                if idle > 0:
+                    self._stop.wait(timeout=min(idle, 3600))
                 schedule.run_pending()
-                time.sleep(60)  # Check every minute
             except KeyboardInterrupt:
+                self.stop()
                 self.logger.info("\n\n👋 Shutting down gracefully...")
                 self.logger.print_summary()
                 break
             except Exception as e:
                 self.logger.error("Scheduler error", exc=e)
-                time.sleep(60)  # Wait and retry
+                self._stop.wait(timeout=60)  # Wait and retry
+    
+    def stop(self):
+        """Stop the scheduler loop"""
+        self._stop.set()
 
 
 def main():
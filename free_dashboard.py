@@ -12,8 +12,25 @@ from output_manager import OutputManager
 from rss_collector import RSSCollector
 from news_ranker import NewsRanker
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 app = Flask(__name__)
 
+
+def ojsonify(obj, status: int = 200):
+    """JSON response encoded with orjson when installed, else flask.jsonify"""
+    if not ORJSON_AVAILABLE:
+        response = jsonify(obj)
+        response.status_code = status
+        return response
+    return app.response_class(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+                              status=status, mimetype='application/json')
+
+
 # Initialize managers (lazy loading)
 _output_manager = None
 _collector = None
@@ -44,31 +61,55 @@ def get_ranker():
     return _ranker
 
 
-@app.route('/')
-def index():
-    """Main dashboard page"""
-    return render_template('dashboard.html')
-
+# Today's posts, reused until the day folder changes
+_posts_cache = {"key": None, "value": None}
 
-@app.route('/api/posts')
-def get_posts():
-    """Get today's posts"""
+def _cached_posts():
+    """Get today's posts, re-reading only when a file in the folder is added, removed or rewritten"""
+    output = get_output_manager()
+    # Directory mtime alone misses in-place rewrites of captions/meta, so key on per-file stats
     try:
-        output = get_output_manager()
+        with os.scandir(output.today_dir) as it:
+            stats = frozenset((entry.name, entry.stat().st_mtime_ns, entry.stat().st_size) for entry in it)
+    except FileNotFoundError:
+        stats = frozenset()
+    key = (output.today_dir, stats)
+    
+    if _posts_cache["key"] != key:
         posts = output.get_today_posts()
         
-        # Add file existence checks
+        # Add file existence checks (all post files live in today_dir)
+        today_files = {name for name, _, _ in stats}
         for post in posts:
             files = post.get('files', {})
             file_status = {}
             for file_type, file_path in files.items():
                 file_status[file_type] = {
                     'path': file_path,
-                    'exists': os.path.exists(file_path) if file_path else False
+                    'exists': os.path.basename(file_path) in today_files if file_path else False
                 }
             post['file_status'] = file_status
         
-        return jsonify({
+        _posts_cache["key"] = key
+        _posts_cache["value"] = posts
+    
+    return _posts_cache["value"]
+
+
+@app.route('/')
+def index():
+    """Main dashboard page"""
+    return render_template('dashboard.html')
+
+
+@app.route('/api/posts')
+def get_posts():
+    """Get today's posts"""
+    try:
+        output = get_output_manager()
+        posts = _cached_posts()
+        
+        return ojsonify({
             'success': True,
             'date': output.date_str,
             'count': len(posts),
@@ -76,7 +117,7 @@ def get_posts():
         })
         
     except Exception as e:
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e),
             'count': 0,
@@ -88,44 +129,47 @@ def get_posts():
 def get_post_detail(post_num):
     """Get detailed info for a specific post"""
     try:
-        output = get_output_manager()
-        posts = output.get_today_posts()
+        posts = _cached_posts()
         
         post = next((p for p in posts if p['number'] == post_num), None)
         
         if not post:
-            return jsonify({'success': False, 'error': 'Post not found'}), 404
+            return ojsonify({'success': False, 'error': 'Post not found'}), 404
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'post': post
         })
         
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return ojsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/post/<int:post_num>/content/<content_type>')
 def get_post_content(post_num, content_type):
     """Get specific content for a post"""
     try:
-        output = get_output_manager()
-        posts = output.get_today_posts()
+        posts = _cached_posts()
         
         post = next((p for p in posts if p['number'] == post_num), None)
         
         if not post:
-            return jsonify({'success': False, 'error': 'Post not found'}), 404
+            return ojsonify({'success': False, 'error': 'Post not found'}), 404
         
         file_path = post.get('files', {}).get(content_type)
         
         if not file_path or not os.path.exists(file_path):
-            return jsonify({'success': False, 'error': 'File not found'}), 404
+            return ojsonify({'success': False, 'error': 'File not found'}), 404
+        
+        # ?raw=1 serves the file as-is (sendfile, ETag/304) instead of JSON
+        if request.args.get('raw') == '1':
+            return send_file(file_path, mimetype='text/plain; charset=utf-8',
+                             conditional=True, etag=True)
         
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'content': content,
             'post_number': post_num,
@@ -133,7 +177,7 @@ def get_post_content(post_num, content_type):
         })
         
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return ojsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/post/<int:post_num>/image')
@@ -144,7 +188,10 @@ def get_post_image(post_num):
         image_path = os.path.join(output.today_dir, f"post_{post_num}_image.png")
         
         if os.path.exists(image_path):
-            return send_file(image_path, mimetype='image/png')
+            # Rewritten in place every cycle: no max_age, so browsers revalidate
+            # each time (Cache-Control: no-cache) and get a cheap 304 if unchanged
+            return send_file(image_path, mimetype='image/png', conditional=True,
+                             etag=True, last_modified=os.path.getmtime(image_path))
         else:
             return "Image not found", 404
             
@@ -156,8 +203,7 @@ def get_post_image(post_num):
 def download_file(post_num, content_type):
     """Download a specific file"""
     try:
-        output = get_output_manager()
-        posts = output.get_today_posts()
+        posts = _cached_posts()
         
         post = next((p for p in posts if p['number'] == post_num), None)
         
@@ -200,10 +246,10 @@ def get_stats():
                 pass
         
         # Output stats
-        posts = output.get_today_posts()
+        posts = _cached_posts()
         summary = output.get_post_summary()
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'date': output.date_str,
             'stats': {
@@ -217,7 +263,7 @@ def get_stats():
         })
         
     except Exception as e:
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e),
             'stats': {}
@@ -234,14 +280,14 @@ def get_report():
         if os.path.exists(report_path):
             with open(report_path, 'r', encoding='utf-8') as f:
                 report = f.read()
-            return jsonify({'success': True, 'report': report})
+            return ojsonify({'success': True, 'report': report})
         else:
             # Generate on the fly
             report = output.create_daily_report()
-            return jsonify({'success': True, 'report': report})
+            return ojsonify({'success': True, 'report': report})
             
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+        return ojsonify({'success': False, 'error': str(e)})
 
 
 @app.route('/api/dates')
@@ -251,29 +297,47 @@ def get_available_dates():
         output = get_output_manager()
         dates = []
         
-        for folder in sorted(os.listdir(output.base_dir), reverse=True):
-            folder_path = os.path.join(output.base_dir, folder)
-            if os.path.isdir(folder_path) and folder != "archive":
+        with os.scandir(output.base_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False) or entry.name == "archive":
+                    continue
                 # Check if it's a date folder
                 try:
-                    datetime.strptime(folder, '%Y-%m-%d')
-                    # Count posts
-                    post_count = len([f for f in os.listdir(folder_path) if f.endswith('_meta.json')])
-                    dates.append({
-                        'date': folder,
-                        'post_count': post_count,
-                        'is_today': folder == output.date_str
-                    })
+                    datetime.strptime(entry.name, '%Y-%m-%d')
                 except ValueError:
                     continue
+                # Count posts
+                with os.scandir(entry.path) as files:
+                    post_count = sum(1 for f in files if f.name.endswith('_meta.json'))
+                dates.append({
+                    'date': entry.name,
+                    'post_count': post_count,
+                    'is_today': entry.name == output.date_str
+                })
+        
+        dates.sort(key=lambda d: d['date'], reverse=True)
         
-        return jsonify({'success': True, 'dates': dates})
+        return ojsonify({'success': True, 'dates': dates})
         
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e), 'dates': []})
+        return ojsonify({'success': False, 'error': str(e), 'dates': []})
+
+
+def _prewarm():
+    """Initialize managers and load today's posts before the first request"""
+    try:
+        get_output_manager()
+        get_collector()
+        get_ranker()
+        _cached_posts()
+    except Exception:
+        pass
 
 
 if __name__ == '__main__':
+    import threading
+    threading.Thread(target=_prewarm, daemon=True).start()
+    
     print("\n" + "=" * 50)
     print(" 🌐 Modern_USA_News Dashboard")
     print("=" * 50)
@@ -281,4 +345,8 @@ if __name__ == '__main__':
     print(" 💡 Press Ctrl+C to stop")
     print("=" * 50 + "\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    try:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=5000, threads=8)
+    except ImportError:
+        app.run(debug=False, host='0.0.0.0', port=5000, threaded=True)
@@ -4,23 +4,127 @@ Uses Ollama (local, free) with HuggingFace API fallback
 """
 
 import requests
+import hashlib
+import json
+import os
+import re
+import copy
+import threading
 import time
-from typing import Dict, Optional
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from requests.adapters import HTTPAdapter
 from rss_config import (
     OLLAMA_MODELS, HUGGINGFACE_MODELS, HUGGINGFACE_API_KEY,
     CHANNEL_HANDLE, CATEGORY_HASHTAGS, COMMON_HASHTAGS,
-    OLLAMA_TIMEOUT, OLLAMA_DELAY, MAX_PROMPT_CHARS
+    OLLAMA_TIMEOUT, OLLAMA_DELAY, OLLAMA_BURST, OLLAMA_KEEP_ALIVE, OLLAMA_NUM_PREDICT,
+    OLLAMA_NUM_CTX, MAX_PROMPT_CHARS,
+    LLM_CACHE_DIR
 )
 
+# Bump whenever the prompt template or reply format changes so cached content is invalidated
+PROMPT_VERSION = "v3"
+
+# Response sections: label + body up to the next section header, in one pass.
+# Headers may carry a list/markdown prefix ("2. SLIDE_2:", "**SLIDE_2:**", "- ", "## ").
+_SECTION_LABELS = r'SLIDE_[1-4]|IMAGE_PROMPT|FIRST_COMMENT|CAPTION'
+_SECTION_PREFIX = r'(?:(?:\d+[.)]|[*#-]+)\s*)*'
+_SECTION_SPLIT = re.compile(
+    rf'(?P<label>{_SECTION_LABELS})[*:\s]+(?P<body>.*?)'
+    rf'(?=\n[ \t]*{_SECTION_PREFIX}(?:{_SECTION_LABELS})[*:\s]|\Z)',
+    re.IGNORECASE | re.DOTALL
+)
+_SECTION_NAMES = ('SLIDE_1', 'SLIDE_2', 'SLIDE_3', 'SLIDE_4', 'IMAGE_PROMPT', 'FIRST_COMMENT', 'CAPTION')
+_HTML_RE = re.compile(r'<[^>]+>')
+_QUOTE_TABLE = str.maketrans({
+    '"': "'", '\u201c': "'", '\u201d': "'", '\u2018': "'", '\u2019': "'",
+    '\u2014': '-', '\xa0': ' '
+})
+_WORD_RE = re.compile(r'\b[a-z]{4,}\b')
+_STOPWORDS = frozenset({'this', 'that', 'with', 'from', 'have', 'been', 'were', 'said', 'will', 'their'})
+
+# Hashtag line per category (5 category tags + 5 common tags), built once
+_HASHTAG_CACHE = {
+    category: ' '.join((tags[:5] + COMMON_HASHTAGS[:5])[:10])
+    for category, tags in CATEGORY_HASHTAGS.items()
+}
+_DEFAULT_HASHTAGS = ' '.join(COMMON_HASHTAGS[:5])
+
+
+# Prompt around the article fields. The instructions and the reply format are
+# one list (labels must match _SECTION_SPLIT), keeping the prompt short for Ollama.
+_PROMPT_PREFIX = f'You are a professional news writer for the Instagram account "{CHANNEL_HANDLE}".\n\nArticle:\n'
+_PROMPT_SUFFIX = """Tone: professional, neutral, modern news anchor. Clear and concise.
+Reply in exactly this format:
+SLIDE_1: hook headline (max 12 words)
+SLIDE_2: core summary (max 40 words)
+SLIDE_3: why it matters (max 35 words)
+SLIDE_4: engaging question for the audience + "Follow Modern_USA_News"
+IMAGE_PROMPT: detailed image prompt; realistic editorial news photography, professional, neutral, no text, no logos, symbolic imagery
+FIRST_COMMENT: neutral, open-ended comment to encourage discussion; no bias or strong opinions
+CAPTION: 4-paragraph Instagram caption summarizing the story
+"""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    Lets `burst` calls through at once, then refills at `rate` calls per second.
+    """
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take a token, sleeping only if the bucket is empty"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
 class FreeContentGenerator:
+    # Generated content kept in memory for near-duplicate stories (LRU)
+    MEMO_SIZE = 1000
+    
+    # Circuit breaker: skip an Ollama model for a while after repeated failures
+    BREAKER_THRESHOLD = 3
+    BREAKER_COOLDOWN = 300  # seconds
+    
+    # Total wall-clock budget for the parallel HuggingFace fallback
+    HF_BUDGET = 45  # seconds
+    
     def __init__(self):
+        # One keep-alive session for Ollama and HuggingFace (no per-call handshakes)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
         self.ollama_available = self._check_ollama()
+        self._ollama_bucket = TokenBucket(rate=1 / OLLAMA_DELAY, burst=OLLAMA_BURST)
+        self._memo: "OrderedDict[str, Dict]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self._failure_counts: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+        self._breaker_lock = threading.Lock()
         print(f"🤖 Content Generator initialized (Ollama: {'✅' if self.ollama_available else '❌'})")
     
     def _check_ollama(self) -> bool:
         """Check if Ollama is running locally"""
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=2)
+            response = self.session.get("http://localhost:11434/api/tags", timeout=2)
             return response.status_code == 200
         except:
             return False
@@ -32,70 +136,165 @@ class FreeContentGenerator:
         source = article['source']
         category = article.get('category', 'General')
         
+        # Reuse content generated for this article on an earlier (or failed) run
+        cache_path = self._cache_path(article)
+        cached = self._load_cached(cache_path)
+        if cached:
+            print("   ♻️  Using cached content")
+            return cached
+        
         # Truncate content to reduce Ollama payload
         safe_desc = self._truncate_context(description)
         
+        # The same story republished by another source (same normalized text)
+        memo_key = self._memo_key(title, safe_desc, category)
+        memo = self._memo_get(memo_key)
+        if memo:
+            print("   ♻️  Reusing content from a duplicate story")
+            return memo
+        
         # Try Ollama first (local, free, fast)
         if self.ollama_available:
             try:
-                # Add delay between requests to prevent CPU overload
-                time.sleep(OLLAMA_DELAY)
-                return self._generate_with_ollama(title, safe_desc, source, category)
+                # Rate-limit requests to prevent CPU overload (waits only when bursting)
+                self._ollama_bucket.acquire()
+                content = self._generate_with_ollama(title, safe_desc, source, category)
+                self._save_cached(cache_path, content)
+                self._memo_put(memo_key, content)
+                return content
             except Exception as e:
                 print(f"   ⚠️  Ollama failed: {e}, trying HuggingFace...")
         
         # Fallback to HuggingFace
         try:
-            return self._generate_with_huggingface(title, description, source, category)
+            content = self._generate_with_huggingface(title, description, source, category)
+            self._save_cached(cache_path, content)
+            self._memo_put(memo_key, content)
+            return content
         except Exception as e:
             print(f"   ⚠️  HuggingFace failed: {e}, using template fallback...")
         
         # Final fallback
         return self._generate_fallback(title, description, source, category)
 
+    def generate_content_batch(self, articles: List[Dict], max_workers: int = 4) -> List[Optional[Dict[str, str]]]:
+        """
+        Generate content for several articles concurrently.
+        Results are in input order; an article whose generation raised gets None.
+        Ollama only overlaps requests when the server runs with OLLAMA_NUM_PARALLEL > 1.
+        """
+        def generate(article):
+            try:
+                return self.generate_content(article)
+            except Exception as e:
+                print(f"   ⚠️  Generation failed for '{article.get('title', '')[:40]}': {e}")
+                return None
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(generate, articles))
+    
+    def _memo_key(self, title: str, desc: str, category: str) -> str:
+        """Key on case/whitespace-normalized title, start of description and category"""
+        norm_title = ' '.join(title.lower().split())
+        norm_desc = ' '.join(desc.lower().split())[:200]
+        return hashlib.sha1(f"{norm_title}\x00{norm_desc}\x00{category}".encode('utf-8')).hexdigest()
+    
+    def _memo_get(self, key: str) -> Optional[Dict]:
+        """Copy of remembered content (callers may modify it), or None"""
+        with self._memo_lock:
+            content = self._memo.get(key)
+            if content is None:
+                return None
+            self._memo.move_to_end(key)
+        return copy.deepcopy(content)
+    
+    def _memo_put(self, key: str, content: Dict):
+        """Remember content, evicting the least recently used entry when full"""
+        with self._memo_lock:
+            self._memo[key] = copy.deepcopy(content)
+            self._memo.move_to_end(key)
+            if len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+    
+    def _cache_path(self, article: Dict) -> str:
+        """Cache file for an article, keyed on its title and link, the prompt version and models"""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{PROMPT_VERSION}\x00{','.join(OLLAMA_MODELS)}\x00{','.join(HUGGINGFACE_MODELS)}\x00".encode('utf-8'))
+        h.update(article['title'].encode('utf-8'))
+        h.update(article.get('link', '').encode('utf-8'))
+        return os.path.join(LLM_CACHE_DIR, f"{h.hexdigest()}.json")
+    
+    def _load_cached(self, path: str) -> Optional[Dict]:
+        """Read cached content, or None if missing or unreadable"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _save_cached(self, path: str, content: Dict):
+        """Store AI-generated content (template fallbacks are never cached)"""
+        try:
+            os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(content, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"   ⚠️  Could not cache content: {e}")
+    
     def _truncate_context(self, text: str) -> str:
         """Truncate context for Ollama payload efficiency"""
         if not text: return ""
-        # Strip quotes and basic HTML tags
-        clean_text = re.sub(r'<[^>]+>', '', text)
-        clean_text = clean_text.replace('"', "'").strip()
+        # Strip basic HTML tags, then normalize quotes/dashes/nbsp in one pass
+        clean_text = _HTML_RE.sub('', text).translate(_QUOTE_TABLE).strip()
         if len(clean_text) > MAX_PROMPT_CHARS:
             return clean_text[:MAX_PROMPT_CHARS] + "..."
         return clean_text
 
-    def warmup_ollama(self):
-        """Send a lightweight prompt to pre-load Ollama models"""
+    def preload(self):
+        """
+        Load the primary Ollama model into memory ahead of the first article.
+        An empty prompt makes Ollama load the weights and return without generating.
+        """
         if not self.ollama_available: return
-        print(f"   🔥 Warming up Ollama models...")
-        for model in OLLAMA_MODELS:
-            try:
-                requests.post(
-                    "http://localhost:11434/api/generate",
-                    json={"model": model, "prompt": "ready?", "stream": False},
-                    timeout=10 # Short timeout for warmup
-                )
-            except:
-                continue
+        model = OLLAMA_MODELS[0]
+        print(f"   🔥 Preloading Ollama model {model}...")
+        try:
+            response = self.session.post(
+                "http://localhost:11434/api/generate",
+                json={"model": model, "prompt": "", "keep_alive": OLLAMA_KEEP_ALIVE},
+                timeout=OLLAMA_TIMEOUT
+            )
+            load_ms = response.json().get('load_duration', 0) / 1e6
+            print(f"   🔥 {model} ready (loaded in {load_ms:.0f} ms)")
+        except Exception as e:
+            print(f"   ⚠️  Ollama preload failed: {e}")
     
     def _generate_with_ollama(self, title: str, desc: str, source: str, category: str) -> Dict[str, str]:
         """Generate content using local Ollama"""
         
         prompt = self._build_prompt(title, desc, source, category)
         
-        # Try each Ollama model
+        # Try each Ollama model (skipping ones whose breaker is open)
         for model in OLLAMA_MODELS:
+            if time.monotonic() < self._open_until.get(model, 0):
+                continue
             try:
                 print(f"   🤖 Trying Ollama model: {model}...")
                 
-                response = requests.post(
+                response = self.session.post(
                     "http://localhost:11434/api/generate",
                     json={
                         "model": model,
                         "prompt": prompt,
                         "stream": False,
+                        "keep_alive": OLLAMA_KEEP_ALIVE,
                         "options": {
                             "temperature": 0.7,
-                            "top_p": 0.9
+                            "top_p": 0.9,
+                            "num_predict": OLLAMA_NUM_PREDICT,
+                            "num_ctx": OLLAMA_NUM_CTX
                         }
                     },
                     timeout=OLLAMA_TIMEOUT
@@ -106,102 +305,107 @@ class FreeContentGenerator:
                     text = result['response']
                     parsed = self._parse_response(text, title, desc, category)
                     print(f"      ✅ Generated with {model}")
+                    self._record_model_result(model, ok=True)
                     return parsed
+                
+                self._record_model_result(model, ok=False)
                     
             except Exception as e:
                 print(f"      ⚠️  {model} failed: {e}")
+                self._record_model_result(model, ok=False)
                 continue
         
         raise Exception("All Ollama models failed")
     
+    def _record_model_result(self, model: str, ok: bool):
+        """Update a model's failure count; open its breaker after BREAKER_THRESHOLD failures"""
+        with self._breaker_lock:
+            if ok:
+                self._failure_counts[model] = 0
+                return
+            failures = self._failure_counts.get(model, 0) + 1
+            self._failure_counts[model] = failures
+            if failures >= self.BREAKER_THRESHOLD:
+                self._open_until[model] = time.monotonic() + self.BREAKER_COOLDOWN
+                self._failure_counts[model] = 0
+                print(f"      🚫 {model} disabled for {self.BREAKER_COOLDOWN}s after {failures} failures")
+    
     def _generate_with_huggingface(self, title: str, desc: str, source: str, category: str) -> Dict[str, str]:
         """Generate content using HuggingFace Inference API (FREE)"""
         
         prompt = self._build_prompt(title, desc, source, category)
         
-        # Try HuggingFace models
-        for model in HUGGINGFACE_MODELS:
-            try:
-                print(f"   🤖 Trying HuggingFace model: {model}...")
-                
-                headers = {}
-                if HUGGINGFACE_API_KEY:
-                    headers["Authorization"] = f"Bearer {HUGGINGFACE_API_KEY}"
-                
-                response = requests.post(
-                    f"https://api-inference.huggingface.co/models/{model}",
-                    headers=headers,
-                    json={"inputs": prompt, "parameters": {"max_new_tokens": 500}},
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if isinstance(result, list) and len(result) > 0:
-                        text = result[0].get('generated_text', '')
-                        parsed = self._parse_response(text, title, desc, category)
-                        print(f"      ✅ Generated with {model}")
-                        return parsed
-                
-            except Exception as e:
-                print(f"      ⚠️  {model} failed: {e}")
-                continue
+        # Query all HuggingFace models at once; first usable reply wins
+        executor = ThreadPoolExecutor(max_workers=len(HUGGINGFACE_MODELS) or 1)
+        futures = {executor.submit(self._query_huggingface, model, prompt): model for model in HUGGINGFACE_MODELS}
+        try:
+            for future in as_completed(futures, timeout=self.HF_BUDGET):
+                model = futures[future]
+                try:
+                    text = future.result()
+                except Exception as e:
+                    print(f"      ⚠️  {model} failed: {e}")
+                    continue
+                if text:
+                    parsed = self._parse_response(text, title, desc, category)
+                    print(f"      ✅ Generated with {model}")
+                    return parsed
+        except FuturesTimeout:
+            print(f"      ⚠️  HuggingFace budget of {self.HF_BUDGET}s exceeded")
+        finally:
+            # Don't wait on stragglers; their replies are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
         
         raise Exception("All HuggingFace models failed")
     
+    def _query_huggingface(self, model: str, prompt: str) -> Optional[str]:
+        """POST one prompt to a HuggingFace model, returning generated text or None"""
+        print(f"   🤖 Trying HuggingFace model: {model}...")
+        
+        headers = {}
+        if HUGGINGFACE_API_KEY:
+            headers["Authorization"] = f"Bearer {HUGGINGFACE_API_KEY}"
+        
+        response = self.session.post(
+            f"https://api-inference.huggingface.co/models/{model}",
+            headers=headers,
+            json={"inputs": prompt, "parameters": {"max_new_tokens": 500}},
+            timeout=30
+        )
+        
+        if response.status_code == 200:
+            result = response.json()
+            if isinstance(result, list) and len(result) > 0:
+                return result[0].get('generated_text', '')
+        return None
+    
     def _build_prompt(self, title: str, desc: str, source: str, category: str) -> str:
         """Build prompt for LLM"""
-        return f"""You are a professional news writer for the Instagram account "{CHANNEL_HANDLE}".
-
-Article:
-Title: {title}
-Details: {desc}
-Source: {source}
-Category: {category}
-
-Create content for Instagram:
-
-1. CAROUSEL_SLIDE_1: Hook headline (max 12 words)
-2. CAROUSEL_SLIDE_2: Core summary (max 40 words)
-3. CAROUSEL_SLIDE_3: Why it matters (max 35 words)
-4. CAROUSEL_SLIDE_4: Engaging question for audience + "Follow Modern_USA_News"
-5. IMAGE_PROMPT: A detailed image generation prompt.
-   Style: realistic editorial news photography, professional, neutral, no text, no logos, symbolic imagery.
-6. FIRST_COMMENT: A neutral, open-ended first comment to encourage discussion. No bias, no strong opinions.
-7. CAPTION: Write a 4-paragraph Instagram caption summarizing the story.
-
-Tone: Professional, neutral, modern news anchor. Clear and concise.
-
-Format your response as:
-SLIDE_1: [content]
-SLIDE_2: [content]
-SLIDE_3: [content]
-SLIDE_4: [content]
-IMAGE_PROMPT: [your detailed image prompt]
-FIRST_COMMENT: [first comment]
-CAPTION: [your full caption]
-"""
+        return (
+            _PROMPT_PREFIX
+            + f"Title: {title}\nDetails: {desc[:MAX_PROMPT_CHARS]}\nSource: {source}\nCategory: {category}\n\n"
+            + _PROMPT_SUFFIX
+        )
     
     def _parse_response(self, text: str, title: str, desc: str, category: str) -> Dict[str, str]:
         """Parse LLM response"""
         
-        # Extract sections
-        slide1_match = re.search(r'SLIDE_1[:\s]+(.+?)(?=\nSLIDE_2|$)', text, re.IGNORECASE | re.DOTALL)
-        slide2_match = re.search(r'SLIDE_2[:\s]+(.+?)(?=\nSLIDE_3|$)', text, re.IGNORECASE | re.DOTALL)
-        slide3_match = re.search(r'SLIDE_3[:\s]+(.+?)(?=\nSLIDE_4|$)', text, re.IGNORECASE | re.DOTALL)
-        slide4_match = re.search(r'SLIDE_4[:\s]+(.+?)(?=\nIMAGE_PROMPT|$)', text, re.IGNORECASE | re.DOTALL)
-        prompt_match = re.search(r'IMAGE_PROMPT[:\s]+(.+?)(?=\nFIRST_COMMENT|$)', text, re.IGNORECASE | re.DOTALL)
-        comment_match = re.search(r'FIRST_COMMENT[:\s]+(.+?)(?=\nCAPTION|$)', text, re.IGNORECASE | re.DOTALL)
-        caption_match = re.search(r'CAPTION[:\s]+(.+)', text, re.IGNORECASE | re.DOTALL)
+        # Extract sections: plain str.find on well-formed output, regex otherwise
+        sections = self._split_sections(text)
+        if sections is None:
+            sections = {}
+            for match in _SECTION_SPLIT.finditer(text):
+                # First occurrence of a label wins
+                sections.setdefault(match.group('label').upper(), match.group('body').strip())
         
-        slide1 = self._enforce_limit(slide1_match.group(1).strip() if slide1_match else title, 12)
-        slide2 = self._enforce_limit(slide2_match.group(1).strip() if slide2_match else desc, 40)
-        slide3 = self._enforce_limit(slide3_match.group(1).strip() if slide3_match else "Developing story...", 35)
-        slide4 = slide4_match.group(1).strip() if slide4_match else "What are your thoughts? Follow Modern_USA_News"
+        slide1 = self._enforce_limit(sections.get('SLIDE_1') or title, 12)
+        slide2 = self._enforce_limit(sections.get('SLIDE_2') or desc, 40)
+        slide3 = self._enforce_limit(sections.get('SLIDE_3') or "Developing story...", 35)
+        slide4 = sections.get('SLIDE_4') or "What are your thoughts? Follow Modern_USA_News"
         
-        image_prompt = prompt_match.group(1).strip() if prompt_match else f"realistic editorial news photography of {title}, professional, neutral, no text"
-        first_comment = comment_match.group(1).strip() if comment_match else "What do you think about this development?"
-        caption = caption_match.group(1).strip() if caption_match else desc
+        image_prompt = sections.get('IMAGE_PROMPT') or f"realistic editorial news photography of {title}, professional, neutral, no text"
+        first_comment = sections.get('FIRST_COMMENT') or "What do you think about this development?"
+        caption = sections.get('CAPTION') or desc
         
         # Add signature and hashtags to caption
         hashtags = self._generate_hashtags(category)
@@ -220,6 +424,22 @@ CAPTION: [your full caption]
             "category": category
         }
 
+    def _split_sections(self, text: str) -> Optional[Dict[str, str]]:
+        """Slice sections by exact 'LABEL:' headers; None if any is missing"""
+        hits = []
+        for name in _SECTION_NAMES:
+            i = text.find(name + ':')
+            if i < 0 or (i and text[i - 1] != '\n'):
+                return None
+            hits.append((i, name))
+        hits.sort()
+        
+        sections = {}
+        for k, (i, name) in enumerate(hits):
+            end = hits[k + 1][0] if k + 1 < len(hits) else len(text)
+            sections[name] = text[i + len(name) + 1:end].strip()
+        return sections
+
     def _enforce_limit(self, text: str, word_limit: int) -> str:
         """Truncate text to word limit and add ellipsis if needed"""
         words = text.split()
@@ -271,28 +491,15 @@ What are your thoughts on this development? Let us know in the comments! 👇
     
     def _generate_hashtags(self, category: str) -> str:
         """Generate hashtags"""
-        category_tags = CATEGORY_HASHTAGS.get(category, [])
-        all_tags = category_tags[:5] + COMMON_HASHTAGS[:5]
-        return ' '.join(all_tags[:10])
+        return _HASHTAG_CACHE.get(category, _DEFAULT_HASHTAGS)
     
     def _extract_keywords(self, title: str, desc: str) -> str:
         """Extract top 3 keywords"""
         text = f"{title} {desc}".lower()
         
-        # Simple keyword extraction (can be improved)
-        words = re.findall(r'\b[a-z]{4,}\b', text)
-        word_freq = {}
-        for word in words:
-            word_freq[word] = word_freq.get(word, 0) + 1
-        
-        # Filter common words
-        common_words = {'this', 'that', 'with', 'from', 'have', 'been', 'were', 'said', 'will', 'their'}
-        filtered = {w: c for w, c in word_freq.items() if w not in common_words}
-        
-        top_words = sorted(filtered.items(), key=lambda x: x[1], reverse=True)[:3]
-        keywords = ', '.join([w[0].title() for w in top_words])
-        
-        return keywords
+        # Simple keyword extraction (can be improved): most frequent non-common words
+        counts = Counter(w for w in _WORD_RE.findall(text) if w not in _STOPWORDS)
+        return ', '.join(w.title() for w, _ in counts.most_common(3))
 
 
 if __name__ == "__main__":
@@ -4,19 +4,130 @@ Uses static background and typography.
 """
 
 from PIL import Image, ImageDraw, ImageFont
-import textwrap
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import requests
+import time
 import os
-from config import CATEGORIES, FONTS, POST_WIDTH, POST_HEIGHT, CHANNEL_NAME
+from config import CATEGORIES, FONTS, POST_WIDTH, POST_HEIGHT, CHANNEL_NAME, FAL_KEY
+
+# Source images never need more pixels than the post itself
+SOURCE_MAX_SIZE = max(POST_WIDTH, POST_HEIGHT, 1024)
+
+# Badge label and color per category, resolved once at import
+_CATEGORY_STYLE = {
+    k: (v["name"].upper(), v["colors"]["primary"]) for k, v in CATEGORIES.items()
+}
+
+
+def load_source_image(fp, max_size: int = SOURCE_MAX_SIZE) -> Image.Image:
+    """Open a source image and shrink it to fit max_size before any compositing"""
+    img = Image.open(fp)
+    # JPEGs can be decoded at reduced scale directly
+    img.draft("RGB", (max_size, max_size))
+    img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+    return img
+
+
+class FalBackground:
+    """Generates post backgrounds on fal.ai's hosted Flux endpoint (GPU, queue-based)"""
+    
+    QUEUE_URL = "https://queue.fal.run/fal-ai/flux/schnell"
+    POLL_SECONDS = 1
+    TIMEOUT = 120
+    
+    def __init__(self, api_key: str):
+        self.headers = {"Authorization": f"Key {api_key}"}
+        self._session = requests.Session()
+    
+    def generate(self, article: dict, width: int, height: int) -> Image.Image:
+        """Submit a request to the queue and poll until the image is ready"""
+        prompt = (
+            f"Editorial news photo background for a story titled \"{article.get('title', '')}\". "
+            "Cinematic, dramatic lighting, dark tones, no text, no logos."
+        )
+        response = self._session.post(
+            self.QUEUE_URL,
+            headers=self.headers,
+            json={"prompt": prompt, "image_size": {"width": width, "height": height}},
+            timeout=30
+        )
+        response.raise_for_status()
+        job = response.json()
+        
+        # No public endpoint for webhooks here, so poll the job status instead
+        deadline = time.time() + self.TIMEOUT
+        while True:
+            status = self._session.get(job["status_url"], headers=self.headers, timeout=30)
+            status.raise_for_status()
+            state = status.json()["status"]
+            if state == "COMPLETED":
+                break
+            if time.time() > deadline:
+                raise TimeoutError(f"fal.ai request {job['request_id']} still {state}")
+            time.sleep(self.POLL_SECONDS)
+        
+        result = self._session.get(job["response_url"], headers=self.headers, timeout=30)
+        result.raise_for_status()
+        image_url = result.json()["images"][0]["url"]
+        
+        image = self._session.get(image_url, timeout=60)
+        image.raise_for_status()
+        return load_source_image(BytesIO(image.content), max(width, height)).convert("RGB")
+
+
+# Per-process generator used by generate_posts_batch workers
+_worker_generator = None
+
+
+def _init_post_worker():
+    """Process pool initializer: one generator (fonts, background) per worker"""
+    global _worker_generator
+    _worker_generator = ImageGenerator()
+
+
+def _render_post(item) -> bool:
+    """Render one (article, hook, output_path) item in a worker"""
+    article, hook, output_path = item
+    try:
+        _worker_generator.generate_post(article, hook, output_path)
+        return True
+    except Exception as e:
+        print(f"      ⚠️  Image failed for {os.path.basename(output_path)}: {e}")
+        return False
+
 
 class ImageGenerator:
+    # Hook font sizes to try, largest first
+    HOOK_FONT_SIZES = (110, 90, 70, 56)
+    
     def __init__(self):
         self.width = POST_WIDTH
         self.height = POST_HEIGHT
         self.margin = 80
         self.assets_dir = os.path.join(os.path.dirname(__file__), "assets")
         self.bg_path = os.path.join(self.assets_dir, "background.png")
+        # Optional GPU backgrounds; the static asset is used when unset or on failure
+        self.fal = FalBackground(FAL_KEY) if FAL_KEY else None
+        
+        self._bg_cached = None
+        
+        # Parsed fonts by (name, size); preload the sizes every post uses
+        self._font_cache = {}
+        self._get_font("arialbd.ttf", 36)
+        self._get_font("arial.ttf", 40)
+        for size in self.HOOK_FONT_SIZES:
+            self._get_font("arialbd.ttf", size)
         
     def _get_font(self, font_name: str, size: int):
+        key = (font_name, size)
+        font = self._font_cache.get(key)
+        if font is None:
+            font = self._font_cache[key] = self._load_font(font_name, size)
+        return font
+    
+    def _load_font(self, font_name: str, size: int):
         try:
             return ImageFont.truetype(font_name, size)
         except OSError:
@@ -26,24 +137,70 @@ class ImageGenerator:
             except OSError:
                 return ImageFont.load_default()
 
+    def generate_posts_batch(self, items: list, max_workers: int = None) -> list:
+        """
+        Render several posts in a process pool (CPU bound, no shared state).
+        items: (article, hook, output_path) tuples. Returns success flags in order.
+        """
+        if not items:
+            return []
+        workers = max_workers or min(len(items), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_post_worker) as pool:
+            return list(pool.map(_render_post, items))
+
+    def _wrap_by_pixels(self, words: list, font, max_px: float) -> list:
+        """Greedily pack words into lines no wider than max_px in the given font"""
+        lines, current, current_w = [], [], 0
+        space_w = font.getlength(" ")
+        for word in words:
+            word_w = font.getlength(word)
+            if current and current_w + space_w + word_w > max_px:
+                lines.append(" ".join(current))
+                current, current_w = [word], word_w
+            else:
+                current_w += word_w + (space_w if current else 0)
+                current.append(word)
+        if current:
+            lines.append(" ".join(current))
+        return lines
+
+    def _get_background(self) -> Image.Image:
+        """Static background resized to the post size (loaded once, copied per post)"""
+        if self._bg_cached is None:
+            if os.path.exists(self.bg_path):
+                img = load_source_image(self.bg_path).convert("RGBA")
+                img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
+            else:
+                # Fallback
+                img = Image.new('RGB', (self.width, self.height), "#111827")
+            self._bg_cached = img
+        return self._bg_cached.copy()
+
+    def _get_ai_background(self, article: dict):
+        """Fetch an AI background, darkened so the white hook stays readable"""
+        try:
+            bg = self.fal.generate(article, self.width, self.height)
+        except Exception as e:
+            print(f"      ⚠️  AI background failed, using static background: {e}")
+            return None
+        bg = bg.resize((self.width, self.height), Image.Resampling.LANCZOS)
+        return Image.blend(bg, Image.new('RGB', bg.size, "#000000"), 0.45)
+
     def generate_post(self, article: dict, hook: str, output_path: str):
         """Generate the post using static background and text hook"""
         category = article.get("category", "general")
-        style = CATEGORIES.get(category, CATEGORIES["general"])
         
         # 1. Load Background
-        if os.path.exists(self.bg_path):
-            img = Image.open(self.bg_path).convert("RGBA")
-            img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-        else:
-            # Fallback
-            img = Image.new('RGB', (self.width, self.height), "#111827")
+        img = self._get_ai_background(article) if self.fal else None
+        if img is None:
+            img = self._get_background()
             
         draw = ImageDraw.Draw(img)
         
         # 2. Draw Category Badge
-        cat_text = style["name"].upper()
-        cat_color = style["colors"]["primary"]
+        cat_text, cat_color = _CATEGORY_STYLE.get(category, _CATEGORY_STYLE["general"])
         
         # Top Left Badge
         font_cat = self._get_font("arialbd.ttf", 36)
@@ -56,29 +213,25 @@ class ImageGenerator:
         
         # 3. Draw The Hook (Center)
         # Big bold typography
-        # Calculate dynamic font size based on length
-        font_size = 110
-        if len(hook) > 20: font_size = 90
-        if len(hook) > 40: font_size = 70
-        
-        font_hook = self._get_font("arialbd.ttf", font_size)
-        
-        # Wrap text
-        max_chars = 15
-        if font_size < 100: max_chars = 20
-        
-        lines = textwrap.wrap(hook.upper(), width=max_chars)
+        # Largest font size whose pixel-wrapped lines fit the text area
+        hook_words = hook.upper().split()
+        max_px = self.width - 2 * self.margin
+        max_height = self.height - 2 * self.margin - 300
+        for font_size in self.HOOK_FONT_SIZES:
+            font_hook = self._get_font("arialbd.ttf", font_size)
+            lines = self._wrap_by_pixels(hook_words, font_hook, max_px)
+            if len(lines) * (font_size + 15) <= max_height:
+                break
         
         # Calculate vertical center
         total_height = len(lines) * (font_size + 10)
         start_y = (self.height - total_height) // 2
         
-        for line in lines:
-            # Drop shadow for depth
-            draw.text((self.margin + 4, start_y + 4), line, font=font_hook, fill="#000000")
-            # Main text
-            draw.text((self.margin, start_y), line, font=font_hook, fill="white")
-            start_y += font_size + 15
+        block = "\n".join(lines)
+        # Drop shadow for depth
+        draw.multiline_text((self.margin + 4, start_y + 4), block, font=font_hook, fill="#000000", spacing=15, align="left")
+        # Main text
+        draw.multiline_text((self.margin, start_y), block, font=font_hook, fill="white", spacing=15, align="left")
             
         # 4. Footer CTA
         cta_text = "READ CAPTION FOR FULL STORY ⤵"
@@ -91,6 +244,7 @@ class ImageGenerator:
         
         draw.text((x_cta, self.height - 150), cta_text, font=font_cta, fill="#AAAAAA")
         
-        # Save
-        img = img.convert("RGB")
-        img.save(output_path, quality=95)
+        # Save (JPEG: q90 with 4:2:0 chroma subsampling, no extra optimize pass)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        img.save(output_path, quality=90, optimize=False, progressive=False, subsampling=2)
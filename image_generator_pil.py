@@ -5,10 +5,12 @@ NO API Keys Required - 100% Local & Free
 """
 
 import os
+import multiprocessing
+from io import BytesIO
 from datetime import datetime
 from typing import Dict, Optional, Tuple, List
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
-from textwrap import wrap
 
 # Configuration
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
@@ -68,6 +70,24 @@ CATEGORY_COLORS = {
 }
 
 
+# Raw font files, read once per process and shared by every size/generator
+_FONT_BYTES: Dict[str, bytes] = {}
+
+
+def _truetype(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """ImageFont.truetype from an in-memory copy of the font file"""
+    data = _FONT_BYTES.get(path)
+    if data is None:
+        with open(path, "rb") as f:
+            data = _FONT_BYTES[path] = f.read()
+    return ImageFont.truetype(BytesIO(data), size)
+
+
+def _flatten(img: Image.Image, bg: Tuple[int, int, int]) -> Image.Image:
+    """Composite an RGBA image onto a solid color in one pass and drop alpha"""
+    return Image.alpha_composite(Image.new("RGBA", img.size, bg + (255,)), img).convert("RGB")
+
+
 class FreeImageGenerator:
     """
     Image generator that creates Instagram-ready news graphics
@@ -77,6 +97,11 @@ class FreeImageGenerator:
     def __init__(self, output_dir: str = "ModernUSANews"):
         self.output_dir = output_dir
         self.background = self._load_background()
+        self._blurred_background = None
+        self._panel_bases: Dict[Tuple, Image.Image] = {}
+        self._card_base = None
+        self._bbox_cache: Dict[Tuple[str, int], Tuple[int, int, int, int]] = {}
+        self._badges: Dict[Tuple, Image.Image] = {}
         self.fonts = self._load_fonts()
         print("🖼️ Image Generator initialized (PIL-based, 100% FREE)")
     
@@ -84,9 +109,11 @@ class FreeImageGenerator:
         """Load or create background image"""
         try:
             if os.path.exists(BACKGROUND_FILE):
-                bg = Image.open(BACKGROUND_FILE)
-                bg = bg.resize(IMAGE_SIZE, Image.Resampling.LANCZOS)
-                bg = bg.convert("RGBA")
+                with Image.open(BACKGROUND_FILE) as src:
+                    # JPEGs decode straight at a reduced scale; no-op for PNG
+                    src.draft("RGB", IMAGE_SIZE)
+                    # LANCZOS: single-image cards use this background unblurred
+                    bg = src.resize(IMAGE_SIZE, Image.Resampling.LANCZOS).convert("RGBA")
                 print("   ✅ Background loaded from assets")
                 return bg
         except Exception as e:
@@ -100,16 +127,13 @@ class FreeImageGenerator:
         img = Image.new("RGBA", IMAGE_SIZE, BACKGROUND_COLOR)
         draw = ImageDraw.Draw(img)
         
-        # Create subtle gradient overlay
-        for y in range(IMAGE_SIZE[1]):
-            # Dark at top, slightly lighter in middle, dark at bottom
-            if y < IMAGE_SIZE[1] // 2:
-                alpha = int(30 * (1 - y / (IMAGE_SIZE[1] // 2)))
-            else:
-                alpha = int(30 * ((y - IMAGE_SIZE[1] // 2) / (IMAGE_SIZE[1] // 2)))
-            
-            overlay_color = (255, 255, 255, alpha)
-            draw.line([(0, y), (IMAGE_SIZE[0], y)], fill=overlay_color[:3])
+        # Subtle white glow: alpha ramps 0 -> 30 -> 0 from top to middle to bottom.
+        # Built as a single-column mask and stretched, instead of one draw.line per row.
+        width, height = IMAGE_SIZE
+        half = height // 2
+        ramp = bytes(int(30 * (1 - abs(y - half) / half)) for y in range(height))
+        mask = Image.frombytes("L", (1, height), ramp).resize(IMAGE_SIZE, Image.Resampling.NEAREST)
+        img.paste((255, 255, 255, 255), (0, 0, width, height), mask)
         
         # Add border accent
         border_color = (60, 80, 120)
@@ -123,6 +147,70 @@ class FreeImageGenerator:
         print("   ✅ Generated gradient background")
         return img
     
+    def _get_blurred_background(self) -> Image.Image:
+        """Blurred carousel background, cached in memory and on disk"""
+        if self._blurred_background is not None:
+            return self._blurred_background
+        
+        # Key the disk copy on the source background so edits invalidate it
+        source = str(os.stat(BACKGROUND_FILE).st_mtime_ns) if os.path.exists(BACKGROUND_FILE) else "gradient"
+        cache_dir = os.path.join(self.output_dir, "_bg_cache")
+        cache_path = os.path.join(cache_dir, f"blurred_{IMAGE_SIZE[0]}x{IMAGE_SIZE[1]}_{source}.png")
+        
+        try:
+            with Image.open(cache_path) as cached:
+                self._blurred_background = cached.convert("RGBA")
+            return self._blurred_background
+        except (OSError, ValueError):
+            pass
+        
+        self._blurred_background = self.background.filter(ImageFilter.GaussianBlur(radius=15))
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            self._blurred_background.save(tmp_path, "PNG")
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"   ⚠️ Could not cache blurred background: {e}")
+        return self._blurred_background
+    
+    def _get_panel_base(self, palette: Dict) -> Image.Image:
+        """Blurred background with the shadow, frosted panel and border composited on"""
+        key = (palette["panel"], palette["border"])
+        base = self._panel_bases.get(key)
+        if base is not None:
+            return base
+        
+        overlay = Image.new("RGBA", IMAGE_SIZE, (0, 0, 0, 0))
+        draw_ov = ImageDraw.Draw(overlay)
+        
+        # Panel dimensions
+        panel_rect = [100, 200, 980, 880] # [L, T, R, B]
+        
+        # Draw shadow (soft drop shadow)
+        shadow_rect = [panel_rect[0]+10, panel_rect[1]+10, panel_rect[2]+10, panel_rect[3]+10]
+        draw_ov.rounded_rectangle(shadow_rect, radius=40, fill=(0, 0, 0, 60))
+        
+        # Draw Frosted Glass Panel
+        draw_ov.rounded_rectangle(panel_rect, radius=40, fill=palette["panel"])
+        
+        # Draw Subtle Border
+        draw_ov.rounded_rectangle(panel_rect, radius=40, outline=palette["border"], width=3)
+        
+        base = Image.alpha_composite(self._get_blurred_background(), overlay)
+        self._panel_bases[key] = base
+        return base
+    
+    def _get_card_base(self) -> Image.Image:
+        """Background with the semi-transparent text box blended in"""
+        if self._card_base is None:
+            base = self.background.copy()
+            # Blend only the box region instead of a full-frame transparent overlay
+            box = Image.new("RGBA", (1001, 641), (15, 20, 30, 200))  # [40, 160, 1040, 800] inclusive
+            base.alpha_composite(box, dest=(40, 160))
+            self._card_base = base
+        return self._card_base
+    
     def _load_fonts(self) -> Dict[str, ImageFont.FreeTypeFont]:
         """Load fonts with fallbacks"""
         fonts = {}
@@ -164,12 +252,12 @@ class FreeImageGenerator:
         bold_font = headline_font or default_font
         
         try:
-            fonts['brand'] = ImageFont.truetype(bold_font, 48)
-            fonts['headline'] = ImageFont.truetype(bold_font, 52)
-            fonts['summary'] = ImageFont.truetype(default_font, 36)
-            fonts['category'] = ImageFont.truetype(bold_font, 32)
-            fonts['date'] = ImageFont.truetype(default_font, 26)
-            fonts['source'] = ImageFont.truetype(default_font, 22)
+            fonts['brand'] = _truetype(bold_font, 48)
+            fonts['headline'] = _truetype(bold_font, 52)
+            fonts['summary'] = _truetype(default_font, 36)
+            fonts['category'] = _truetype(bold_font, 32)
+            fonts['date'] = _truetype(default_font, 26)
+            fonts['source'] = _truetype(default_font, 22)
             print("   ✅ Fonts loaded successfully")
         except Exception as e:
             print(f"   ⚠️ Font loading error: {e}, using defaults")
@@ -222,31 +310,8 @@ class FreeImageGenerator:
     def _create_glass_slide(self, text: str, category: str, slide_num: int, 
                             palette: Dict, output_path: str):
         """Create a single slide with glassmorphism effect"""
-        # 1. Base background
-        img = self.background.copy()
-        
-        # 2. Apply Gaussian Blur ONCE to background
-        img = img.filter(ImageFilter.GaussianBlur(radius=15))
-        
-        # 3. Create panel layer
-        overlay = Image.new("RGBA", IMAGE_SIZE, (0, 0, 0, 0))
-        draw_ov = ImageDraw.Draw(overlay)
-        
-        # Panel dimensions
-        panel_rect = [100, 200, 980, 880] # [L, T, R, B]
-        
-        # Draw shadow (soft drop shadow)
-        shadow_rect = [panel_rect[0]+10, panel_rect[1]+10, panel_rect[2]+10, panel_rect[3]+10]
-        draw_ov.rounded_rectangle(shadow_rect, radius=40, fill=(0, 0, 0, 60))
-        
-        # Draw Frosted Glass Panel
-        draw_ov.rounded_rectangle(panel_rect, radius=40, fill=palette["panel"])
-        
-        # Draw Subtle Border
-        draw_ov.rounded_rectangle(panel_rect, radius=40, outline=palette["border"], width=3)
-        
-        # Composite
-        img = Image.alpha_composite(img, overlay)
+        # 1-3. Blurred background + glass panel depend only on the palette, so cached
+        img = self._get_panel_base(palette).copy()
         draw = ImageDraw.Draw(img)
         
         # 4. Text Content
@@ -272,25 +337,20 @@ class FreeImageGenerator:
                                   
         # Category Badge
         cat_color = CATEGORY_COLORS.get(category, CATEGORY_COLORS["General"])
-        self._draw_category_badge_small(draw, category, cat_color)
+        self._draw_category_badge_small(draw, img, category, cat_color)
         
         # Footer Date
         date_str = datetime.now().strftime("%B %d, %Y")
         draw.text((150, 950), date_str, font=self.fonts['date'], fill=(200, 200, 200))
         
         # 5. Save
-        img_rgb = Image.new("RGB", img.size, palette["bg"])
-        img_rgb.paste(img, mask=img.split()[3])
-        img_rgb.save(output_path, "PNG", quality=95)
+        img_rgb = _flatten(img, palette["bg"])
+        img_rgb.save(output_path, "PNG", compress_level=1)  # Fast zlib level; PNG ignores quality
 
-    def _draw_category_badge_small(self, draw: ImageDraw.Draw, category: str, color: Tuple):
+    def _draw_category_badge_small(self, draw: ImageDraw.Draw, img: Image.Image,
+                                   category: str, color: Tuple):
         """Draw a smaller category badge for carousels"""
-        text = category.upper()
-        bbox = draw.textbbox((0, 0), text, font=self.fonts['category'])
-        text_w = bbox[2] - bbox[0]
-        
-        draw.rounded_rectangle([150, 180, 150 + text_w + 30, 230], radius=15, fill=color)
-        draw.text((165, 190), text, font=self.fonts['category'], fill=(255, 255, 255))
+        img.alpha_composite(self._get_badge(draw, category.upper(), color, 30, 15), dest=(150, 180))
 
     def generate_image(self, headline: str, summary: str, category: str,
                        post_number: int, output_path: Optional[str] = None,
@@ -310,22 +370,8 @@ class FreeImageGenerator:
             Path to generated image
         """
         try:
-            # Create a copy of background
-            img = self.background.copy()
-            draw = ImageDraw.Draw(img)
-            
-            # Draw overlay for text readability
-            overlay = Image.new("RGBA", IMAGE_SIZE, (0, 0, 0, 0))
-            overlay_draw = ImageDraw.Draw(overlay)
-            
-            # Semi-transparent box behind text
-            overlay_draw.rectangle(
-                [40, 160, 1040, 800],
-                fill=(15, 20, 30, 200)
-            )
-            
-            # Blend overlay
-            img = Image.alpha_composite(img, overlay)
+            # Background with the readability box already blended (cached)
+            img = self._get_card_base().copy()
             draw = ImageDraw.Draw(img)
             
             # Draw brand name
@@ -336,7 +382,7 @@ class FreeImageGenerator:
             
             # Draw category badge
             category_color = CATEGORY_COLORS.get(category, CATEGORY_COLORS["General"])
-            self._draw_category_badge(draw, category, category_color)
+            self._draw_category_badge(draw, img, category, category_color)
             
             # Draw headline
             self._draw_multiline_text(
@@ -379,9 +425,8 @@ class FreeImageGenerator:
                 output_path = os.path.join(today_dir, filename)
             
             # Save as RGB (PNG doesn't need RGBA conversion but removes transparency)
-            img_rgb = Image.new("RGB", img.size, (20, 25, 35))
-            img_rgb.paste(img, mask=img.split()[3])
-            img_rgb.save(output_path, "PNG", quality=95)
+            img_rgb = _flatten(img, BACKGROUND_COLOR)
+            img_rgb.save(output_path, "PNG", compress_level=1)  # Fast zlib level; PNG ignores quality
             
             print(f"   🖼️ Image generated: {os.path.basename(output_path)}")
             return output_path
@@ -391,12 +436,22 @@ class FreeImageGenerator:
             # Return placeholder path
             return self._create_placeholder_image(post_number, category)
     
+    def _bbox(self, draw: ImageDraw.Draw, text: str,
+              font: ImageFont.FreeTypeFont) -> Tuple[int, int, int, int]:
+        """textbbox at the origin, memoized per (text, font) for repeated labels"""
+        key = (text, id(font))
+        bbox = self._bbox_cache.get(key)
+        if bbox is None:
+            bbox = draw.textbbox((0, 0), text, font=font)
+            self._bbox_cache[key] = bbox
+        return bbox
+    
     def _draw_text_centered(self, draw: ImageDraw.Draw, text: str, 
                             area: Tuple[int, int, int, int],
                             font: ImageFont.FreeTypeFont, color: Tuple[int, int, int]):
         """Draw text centered in an area"""
         left, top, right, bottom = area
-        bbox = draw.textbbox((0, 0), text, font=font)
+        bbox = self._bbox(draw, text, font)
         text_width = bbox[2] - bbox[0]
         text_height = bbox[3] - bbox[1]
         
@@ -414,17 +469,11 @@ class FreeImageGenerator:
         left, top, right, bottom = area
         max_width = right - left
         
-        # Calculate approximate characters per line
-        test_text = "A" * 20
-        bbox = draw.textbbox((0, 0), test_text, font=font)
-        char_width = (bbox[2] - bbox[0]) / 20
-        chars_per_line = int(max_width / char_width)
-        
-        # Wrap text
-        lines = wrap(text, width=chars_per_line)[:max_lines]
+        # Wrap by measured pixel width instead of an average character width
+        lines = self._wrap_by_pixels(text.split(), font, max_width, max_lines)
         
         # Get line height
-        bbox = draw.textbbox((0, 0), "Ay", font=font)
+        bbox = self._bbox(draw, "Ay", font)
         line_height = bbox[3] - bbox[1] + 8
         
         # Calculate starting Y to center vertically
@@ -433,33 +482,54 @@ class FreeImageGenerator:
         
         for line in lines:
             # Center each line
-            bbox = draw.textbbox((0, 0), line, font=font)
-            text_width = bbox[2] - bbox[0]
-            x = left + (max_width - text_width) // 2
+            x = left + int(max_width - font.getlength(line)) // 2
             
             draw.text((x, y), line, font=font, fill=color)
             y += line_height
     
-    def _draw_category_badge(self, draw: ImageDraw.Draw, category: str,
+    def _wrap_by_pixels(self, words: List[str], font: ImageFont.FreeTypeFont,
+                        max_width: float, max_lines: int) -> List[str]:
+        """Greedily pack words into at most max_lines lines no wider than max_width"""
+        lines, current, current_w = [], [], 0
+        space_w = font.getlength(" ")
+        for word in words:
+            word_w = font.getlength(word)
+            if current and current_w + space_w + word_w > max_width:
+                lines.append(" ".join(current))
+                if len(lines) == max_lines:
+                    return lines
+                current, current_w = [word], word_w
+            else:
+                current_w += word_w + (space_w if current else 0)
+                current.append(word)
+        if current:
+            lines.append(" ".join(current))
+        return lines
+    
+    def _draw_category_badge(self, draw: ImageDraw.Draw, img: Image.Image, category: str,
                              color: Tuple[int, int, int]):
         """Draw category badge"""
-        text = category.upper()
-        bbox = draw.textbbox((0, 0), text, font=self.fonts['category'])
-        text_width = bbox[2] - bbox[0]
+        badge = self._get_badge(draw, category.upper(), color, 40, 25)
         
         # Badge position (centered under brand)
-        badge_x = (IMAGE_SIZE[0] - text_width - 40) // 2
-        badge_y = 185
-        
-        # Draw badge background
-        draw.rounded_rectangle(
-            [badge_x, badge_y, badge_x + text_width + 40, badge_y + 50],
-            radius=25, fill=color
-        )
-        
-        # Draw badge text
-        draw.text((badge_x + 20, badge_y + 10), text, 
-                  font=self.fonts['category'], fill=TEXT_WHITE)
+        badge_x = (IMAGE_SIZE[0] - badge.width + 1) // 2
+        img.alpha_composite(badge, dest=(badge_x, 185))
+    
+    def _get_badge(self, draw: ImageDraw.Draw, text: str, color: Tuple[int, int, int],
+                   pad: int, radius: int) -> Image.Image:
+        """Pre-rasterized rounded badge (50px tall, text inset pad/2), cached per label/color/style"""
+        key = (text, color, pad, radius)
+        badge = self._badges.get(key)
+        if badge is None:
+            bbox = self._bbox(draw, text, self.fonts['category'])
+            text_width = bbox[2] - bbox[0]
+            
+            badge = Image.new("RGBA", (text_width + pad + 1, 51), (0, 0, 0, 0))
+            badge_draw = ImageDraw.Draw(badge)
+            badge_draw.rounded_rectangle([0, 0, text_width + pad, 50], radius=radius, fill=color)
+            badge_draw.text((pad // 2, 10), text, font=self.fonts['category'], fill=TEXT_WHITE)
+            self._badges[key] = badge
+        return badge
     
     def _add_watermark(self, draw: ImageDraw.Draw, img: Image.Image):
         """Add Modern_USA_News watermark to bottom-right corner"""
@@ -467,7 +537,7 @@ class FreeImageGenerator:
         
         try:
             # Get text size
-            bbox = draw.textbbox((0, 0), watermark_text, font=self.fonts['source'])
+            bbox = self._bbox(draw, watermark_text, self.fonts['source'])
             text_width = bbox[2] - bbox[0]
             text_height = bbox[3] - bbox[1]
             
@@ -508,12 +578,22 @@ class FreeImageGenerator:
             today_dir = os.path.join(self.output_dir, "Today")
             os.makedirs(today_dir, exist_ok=True)
             path = os.path.join(today_dir, f"Post{post_number}_placeholder.png")
-            img.save(path, "PNG")
+            img.save(path, "PNG", compress_level=1)
             
             return path
         except:
             return ""
     
+    def _generate_post_image(self, post_number: int, post: Dict) -> str:
+        """Render one batch_generate post dict"""
+        return self.generate_image(
+            headline=post.get('headline', 'Breaking News'),
+            summary=post.get('summary', post.get('image_summary', '')),
+            category=post.get('category', 'General'),
+            post_number=post_number,
+            source=post.get('source', '')
+        )
+    
     def batch_generate(self, posts: list) -> int:
         """
         Generate images for multiple posts
@@ -526,23 +606,57 @@ class FreeImageGenerator:
         """
         success_count = 0
         
-        for i, post in enumerate(posts, 1):
-            try:
-                self.generate_image(
-                    headline=post.get('headline', 'Breaking News'),
-                    summary=post.get('summary', post.get('image_summary', '')),
-                    category=post.get('category', 'General'),
-                    post_number=i,
-                    source=post.get('source', '')
-                )
-                success_count += 1
-            except Exception as e:
-                print(f"   ⚠️ Failed to generate image {i}: {e}")
-                continue
+        # One post isn't worth spawning workers for
+        if len(posts) <= 1:
+            for i, post in enumerate(posts, 1):
+                try:
+                    self._generate_post_image(i, post)
+                    success_count += 1
+                except Exception as e:
+                    print(f"   ⚠️ Failed to generate image {i}: {e}")
+            return success_count
+        
+        # Each post is an independent CPU-bound render: one generator per worker process
+        with ProcessPoolExecutor(
+            max_workers=min(len(posts), os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_carousel_worker,
+            initargs=(self.output_dir,)
+        ) as pool:
+            futures = [pool.submit(render_image, i, post) for i, post in enumerate(posts, 1)]
+            for i, future in enumerate(futures, 1):
+                try:
+                    future.result()
+                    success_count += 1
+                except Exception as e:
+                    print(f"   ⚠️ Failed to generate image {i}: {e}")
         
         return success_count
 
 
+# Per-process generator used when carousels or batch posts are rendered in a process pool
+_worker_generator = None
+
+
+def init_carousel_worker(output_dir: str):
+    """Process pool initializer: build one generator (fonts, background) per worker"""
+    global _worker_generator
+    _worker_generator = FreeImageGenerator(output_dir)
+    _worker_generator._get_blurred_background()
+
+
+def render_carousel(post_number: int, slides: List[str], category: str,
+                    sentiment: str = "Neutral") -> List[str]:
+    """Render a carousel with this worker's generator"""
+    return _worker_generator.generate_carousel(slides, category, post_number, sentiment)
+
+
+
+def render_image(post_number: int, post: Dict) -> str:
+    """Render a batch_generate post with this worker's generator"""
+    return _worker_generator._generate_post_image(post_number, post)
+
+
 if __name__ == "__main__":
     # Test image generation
     generator = FreeImageGenerator()
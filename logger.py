@@ -97,17 +97,17 @@ class NewsLogger:
         self.logger.addHandler(file_handler)
         self.logger.addHandler(error_handler)
     
-    def info(self, message: str, module: str = None):
-        """Log info message"""
+    def info(self, message: str, *args, module: str = None):
+        """Log info message (%-style args are formatted only if emitted)"""
         if module:
             message = f"[{module}] {message}"
-        self.logger.info(message)
+        self.logger.info(message, *args)
     
-    def debug(self, message: str, module: str = None):
-        """Log debug message (file only)"""
+    def debug(self, message: str, *args, module: str = None):
+        """Log debug message (file only) (%-style args are formatted only if emitted)"""
         if module:
             message = f"[{module}] {message}"
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
     
     def warning(self, message: str, module: str = None):
         """Log warning message"""
@@ -6,10 +6,14 @@ Manages file generation with date-based folders and images
 import os
 import json
 import shutil
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional
 from rss_config import OUTPUT_DIR
 
+# Parsed meta JSON by path, reused while (mtime_ns, size) is unchanged
+_META_CACHE: Dict[str, tuple] = {}
+
 
 class OutputManager:
     """
@@ -21,6 +25,9 @@ class OutputManager:
     - Archiving
     """
     
+    # Serializes archiving when it runs in background threads
+    _archive_lock = threading.Lock()
+    
     def __init__(self, output_dir: str = OUTPUT_DIR):
         self.base_dir = output_dir
         self.date_str = datetime.now().strftime('%Y-%m-%d')
@@ -137,30 +144,46 @@ class OutputManager:
         print("   🗑️ Cleared today's folder")
     
     def archive_old_folders(self, keep_days: int = 7):
-        """Move old date folders to archive"""
+        """Move old date folders to archive (safe to run from a background thread)"""
         try:
             from datetime import timedelta
             cutoff_date = datetime.now() - timedelta(days=keep_days)
             
-            for folder in os.listdir(self.base_dir):
-                folder_path = os.path.join(self.base_dir, folder)
-                
-                # Check if it's a date folder
-                if os.path.isdir(folder_path) and folder != "archive":
-                    try:
-                        folder_date = datetime.strptime(folder, '%Y-%m-%d')
-                        if folder_date < cutoff_date:
-                            # Move to archive
-                            dest = os.path.join(self.archive_dir, folder)
-                            shutil.move(folder_path, dest)
-                            print(f"   📦 Archived: {folder}")
-                    except ValueError:
-                        # Not a date folder, skip
-                        continue
+            with self._archive_lock:
+                for folder in os.listdir(self.base_dir):
+                    folder_path = os.path.join(self.base_dir, folder)
+                    
+                    # Check if it's a date folder
+                    if os.path.isdir(folder_path) and folder != "archive":
+                        try:
+                            folder_date = datetime.strptime(folder, '%Y-%m-%d')
+                            if folder_date < cutoff_date:
+                                # Move to archive
+                                dest = os.path.join(self.archive_dir, folder)
+                                shutil.move(folder_path, dest)
+                                print(f"   📦 Archived: {folder}")
+                        except ValueError:
+                            # Not a date folder, skip
+                            continue
                         
         except Exception as e:
             print(f"   ⚠️ Archive error: {e}")
     
+    def _load_meta(self, meta_path: str, st: Optional[os.stat_result] = None) -> Dict:
+        """Load a meta JSON file, skipping the parse if it hasn't changed"""
+        if st is None:
+            st = os.stat(meta_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        
+        cached = _META_CACHE.get(meta_path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        _META_CACHE[meta_path] = (stamp, meta)
+        return meta
+    
     def get_today_posts(self) -> List[Dict]:
         """Get list of today's posts with all data"""
         posts = []
@@ -168,13 +191,18 @@ class OutputManager:
         if not os.path.exists(self.today_dir):
             return posts
         
+        # One scandir pass: meta files (with their stat) and the set of names
+        with os.scandir(self.today_dir) as it:
+            entries = list(it)
+        names = {entry.name for entry in entries}
+        
         # Find all meta.json files
-        for file in sorted(os.listdir(self.today_dir)):
+        for entry in entries:
+            file = entry.name
             if file.endswith('_meta.json'):
                 try:
-                    meta_path = os.path.join(self.today_dir, file)
-                    with open(meta_path, 'r', encoding='utf-8') as f:
-                        meta = json.load(f)
+                    meta_path = entry.path
+                    meta = self._load_meta(meta_path, entry.stat())
                     
                     post_num = meta.get('post_number', 0)
                     base_name = f"post_{post_num}"
@@ -200,7 +228,7 @@ class OutputManager:
                     
                     # Read caption
                     caption_path = post_data['files']['caption']
-                    if os.path.exists(caption_path):
+                    if f"{base_name}_caption.txt" in names:
                         with open(caption_path, 'r', encoding='utf-8') as f:
                             post_data['caption'] = f.read()
                     
@@ -8,13 +8,16 @@ import sqlite3
 import hashlib
 from datetime import datetime, timedelta
 from typing import List, Dict
-import time
+from concurrent.futures import ThreadPoolExecutor
 from rss_config import (
     RSS_FEEDS, DB_PATH, US_KEYWORDS, EXCLUSION_KEYWORDS,
     PRIORITY_KEYWORDS, CATEGORY_KEYWORDS, ARCHIVE_DAYS
 )
 
 class RSSCollector:
+    # Feeds downloaded at once (each source is a different server)
+    MAX_FEED_WORKERS = 16
+    
     def __init__(self, db_path: str = DB_PATH):
         self.db_path = db_path
         self._init_database()
@@ -97,10 +100,11 @@ class RSSCollector:
             return max(category_scores, key=category_scores.get)
         return "General"
     
-    def collect_feed(self, feed_url: str, source_name: str) -> int:
-        """Collect articles from a single RSS feed"""
+    def collect_feed(self, feed_url: str, source_name: str, feed=None) -> int:
+        """Collect articles from a single RSS feed (optionally already downloaded)"""
         try:
-            feed = feedparser.parse(feed_url)
+            if feed is None:
+                feed = feedparser.parse(feed_url)
             added_count = 0
             
             for entry in feed.entries:
@@ -166,19 +170,29 @@ class RSSCollector:
         stats = {}
         total_added = 0
         
-        for source_id, source_data in RSS_FEEDS.items():
-            source_name = source_data["name"]
-            print(f"   📰 Collecting from {source_name}...")
-            
-            source_total = 0
-            for feed_type, feed_url in source_data["feeds"].items():
-                added = self.collect_feed(feed_url, source_name)
-                source_total += added
+        # Download and parse every feed concurrently; database writes stay
+        # on this thread below
+        feed_urls = [url for source_data in RSS_FEEDS.values() for url in source_data["feeds"].values()]
+        with ThreadPoolExecutor(max_workers=self.MAX_FEED_WORKERS) as pool:
+            downloads = {url: pool.submit(feedparser.parse, url) for url in feed_urls}
             
-            stats[source_name] = source_total
-            total_added += source_total
-            print(f"      ✅ Added {source_total} new articles")
-            time.sleep(1)  # Be nice to servers
+            for source_id, source_data in RSS_FEEDS.items():
+                source_name = source_data["name"]
+                print(f"   📰 Collecting from {source_name}...")
+                
+                source_total = 0
+                for feed_type, feed_url in source_data["feeds"].items():
+                    try:
+                        feed = downloads[feed_url].result()
+                    except Exception as e:
+                        print(f"   ❌ Error fetching feed {feed_url}: {e}")
+                        continue
+                    added = self.collect_feed(feed_url, source_name, feed=feed)
+                    source_total += added
+                
+                stats[source_name] = source_total
+                total_added += source_total
+                print(f"      ✅ Added {source_total} new articles")
         
         # Clean old articles
         self._clean_old_articles()
@@ -137,8 +137,13 @@ ARCHIVE_DIR = "Archive"
 # Free LLM Settings (we'll use Ollama locally + HuggingFace API as fallback)
 OLLAMA_MODELS = ["llama3.2:1b", "qwen2.5:1.5b", "phi3:mini", "llama3.2:latest"]  # CPU-optimized models
 OLLAMA_TIMEOUT = 120  # Increased timeout for CPU rendering
-OLLAMA_DELAY = 2      # Delay between batch requests
+OLLAMA_DELAY = 2      # Average seconds between requests (token bucket rate)
+OLLAMA_BURST = 3      # Requests allowed back-to-back before OLLAMA_DELAY applies
+OLLAMA_KEEP_ALIVE = "30m"  # Keep the model resident between articles
+OLLAMA_NUM_PREDICT = 600  # Max tokens generated per post (slides + caption fit well within)
+OLLAMA_NUM_CTX = 2048     # Context window; the prompt plus reply is well under this
 MAX_PROMPT_CHARS = 700 # Truncate article content to reduce payload
+LLM_CACHE_DIR = "cache/llm"  # Generated content per article, reused on reruns
 
 HUGGINGFACE_API_KEY = ""  # Optional: HF free tier
 HUGGINGFACE_MODELS = [